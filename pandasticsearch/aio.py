@@ -0,0 +1,437 @@
+# -*- coding: UTF-8 -*-
+"""
+Asyncio support (Python 3.6+), imported on demand so that the rest of the package
+does not depend on the async syntax.
+"""
+
+import asyncio
+import ssl
+import time
+import weakref
+from collections import deque
+
+from pandasticsearch.client import RestClient
+from pandasticsearch.connection import ConnectionPool
+from pandasticsearch.columnar import ColumnarBuilder
+from pandasticsearch.compression import decompress
+from pandasticsearch.errors import DataFrameException, NoSuchDependencyException, ServerDefinedException
+from pandasticsearch.queries import Agg, Select
+from pandasticsearch.types import Row
+
+# async clients derived from the sync client of the DataFrames
+_async_clients = weakref.WeakKeyDictionary()
+
+
+class _Connection(object):
+    __slots__ = ('reader', 'writer', 'last_used')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.time()
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncRestClient(RestClient):
+    """
+    AsyncRestClient talks to Elasticsearch cluster through native RESTful API with asyncio,
+    so that one event loop multiplexes many concurrent requests.
+
+    HTTP/1.1 keep-alive connections are kept for each host and reused by the following requests.
+    The connections belong to the event loop which opened them.
+
+    >>> from pandasticsearch.aio import AsyncRestClient
+    >>> client = AsyncRestClient('http://host:port')
+    >>> results = await asyncio.gather(client.post('index1/_search', data={}),
+    ...                                client.post('index2/_search', data={}))
+    >>> await client.close()
+    """
+
+    def __init__(self, host, username=None, password=None, verify_ssl=True, codec=None,
+                 maxsize=10, idle_timeout=60, timeout=None, selector='round_robin', dead_timeout=60,
+                 discover_nodes=False, retry=None, circuit_breaker=None, compression=None):
+        """
+        :param host: Host URL of Broker node in the Elasticsearch cluster, or a list of host URLs
+        :param str optional username: Username for authentication
+        :param str optional password: Password for authentication
+        :param bool optional verify_ssl: Whether or not verify the SSL certificate
+        :param optional codec: :class:`JsonCodec <pandasticsearch.codec.JsonCodec>` or its name
+        :param int maxsize: Max number of idle connections kept for each host
+        :param float idle_timeout: Seconds after which an idle connection is discarded
+        :param float optional timeout: Timeout in seconds of each request
+        :param str optional selector: 'round_robin' (default) or 'least_in_flight', see :class:`RestClient`
+        :param float optional dead_timeout: Seconds during which a node which could not be reached is left out
+        :param bool optional discover_nodes: Whether to discover the nodes of the cluster before the first request
+        :param optional retry: :class:`RetryPolicy <pandasticsearch.retry.RetryPolicy>`, see :class:`RestClient`
+        :param optional circuit_breaker: :class:`CircuitBreaker <pandasticsearch.retry.CircuitBreaker>`,
+            see :class:`RestClient`
+        :param str optional compression: 'gzip' or 'deflate' to compress the request and response bodies
+        """
+        super(AsyncRestClient, self).__init__(host, username, password, verify_ssl, codec=codec, selector=selector,
+                                              dead_timeout=dead_timeout, discover_nodes=discover_nodes,
+                                              retry=retry, circuit_breaker=circuit_breaker, compression=compression)
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = {}
+        self._loop = None
+
+    @classmethod
+    def from_client(cls, client):
+        """
+        Creates an AsyncRestClient with the hosts, the credentials, the codec and the retry policy of a
+        :class:`RestClient`.
+        """
+        return cls(client.nodes.hosts, client.username, client.password, client.verify_ssl, codec=client.codec,
+                   selector=client.nodes.selector, dead_timeout=client.nodes.dead_timeout,
+                   retry=client.retry, circuit_breaker=client.circuit_breaker, compression=client.compression)
+
+    def _ssl_context(self):
+        if self.verify_ssl is False:
+            return ssl._create_unverified_context()
+        return ssl.create_default_context()
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        context = self._ssl_context() if scheme == 'https' else None
+        reader, writer = await asyncio.open_connection(host, port, ssl=context)
+        return _Connection(reader, writer)
+
+    async def _acquire(self, key):
+        """
+        :return: a tuple of (connection, whether it is reused)
+        """
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            # the connections of another event loop can not be used
+            self._abandon()
+            self._loop = loop
+
+        now = time.time()
+        conns = self._idle.get(key)
+        while conns:
+            conn = conns.pop()
+            if now - conn.last_used <= self.idle_timeout and not conn.reader.at_eof():
+                return conn, True
+            conn.close()
+        return await self._connect(key), False
+
+    def _release(self, key, conn):
+        conns = self._idle.setdefault(key, deque())
+        if len(conns) < self.maxsize:
+            conn.last_used = time.time()
+            conns.append(conn)
+        else:
+            conn.close()
+
+    def _abandon(self):
+        idle = self._idle
+        self._idle = {}
+        for conns in idle.values():
+            for conn in conns:
+                try:
+                    conn.close()
+                except RuntimeError:
+                    # the event loop of the connection is closed already
+                    pass
+
+    async def close(self):
+        """
+        Closes all the idle connections.
+        """
+        idle = self._idle
+        self._idle = {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+                try:
+                    await conn.writer.wait_closed()
+                except (AttributeError, OSError):
+                    pass
+
+    @staticmethod
+    def _request_head(method, key, path, body, headers):
+        scheme, host, port = key
+        if (scheme, port) in (('http', 80), ('https', 443)):
+            host_header = host
+        else:
+            host_header = '{0}:{1}'.format(host, port)
+        lines = ['{0} {1} HTTP/1.1'.format(method, path), 'Host: {0}'.format(host_header),
+                 'Content-Length: {0}'.format(len(body) if body else 0)]
+        for name, value in headers.items():
+            lines.append('{0}: {1}'.format(name, value))
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    @staticmethod
+    async def _read_body(reader, headers):
+        """
+        :return: a tuple of (body, whether the connection can be reused)
+        """
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                line = await reader.readline()
+                size = int(line.split(b';')[0].strip(), 16)
+                if size == 0:
+                    # trailers
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return b''.join(chunks), True
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+        if 'content-length' in headers:
+            return await reader.readexactly(int(headers['content-length'])), True
+        return await reader.read(), False
+
+    async def _exchange(self, conn, method, key, path, body, headers):
+        conn.writer.write(self._request_head(method, key, path, body, headers))
+        if body:
+            conn.writer.write(body)
+        await conn.writer.drain()
+
+        while True:
+            status_line = await conn.reader.readline()
+            if not status_line:
+                raise ConnectionResetError('The connection was closed by the server')
+            parts = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+            version, status = parts[0], int(parts[1])
+
+            resp_headers = {}
+            while True:
+                line = await conn.reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                resp_headers[name.strip().lower()] = value.strip()
+            if status >= 200:
+                break
+            # skip the informational responses, e.g. 100 Continue
+
+        if method == 'HEAD' or status in (204, 304):
+            data, reusable = b'', True
+        else:
+            data, reusable = await self._read_body(conn.reader, resp_headers)
+        keep_alive = reusable and version == 'HTTP/1.1' and resp_headers.get('connection', '').lower() != 'close'
+        return status, resp_headers, data, keep_alive
+
+    async def _send(self, method, url, body=None, headers=None):
+        key, path = ConnectionPool._split_url(url)
+        headers = headers or {}
+        conn, reused = await self._acquire(key)
+        try:
+            status, resp_headers, data, keep_alive = await self._exchange(conn, method, key, path, body, headers)
+        except (OSError, asyncio.IncompleteReadError):
+            conn.close()
+            if not reused:
+                raise
+            # The server may have closed the idle keep-alive connection, retry on a new one
+            conn = await self._connect(key)
+            try:
+                status, resp_headers, data, keep_alive = await self._exchange(conn, method, key, path, body, headers)
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            # e.g. cancelled in the middle of a response
+            conn.close()
+            raise
+
+        if keep_alive:
+            self._release(key, conn)
+        else:
+            conn.close()
+        return status, resp_headers, data
+
+    async def _request_node(self, method, path, data=None, params=None):
+        """
+        Sends a request to the next node, and to the following ones while they can not be reached.
+        """
+        attempts = len(self.nodes)
+        for attempt in range(attempts):
+            host = self.nodes.acquire()
+            url, body, headers = self._prepare_request(path, data=data, params=params, host=host)
+            try:
+                if self.timeout is not None:
+                    resp = await asyncio.wait_for(self._send(method, url, body, headers), self.timeout)
+                else:
+                    resp = await self._send(method, url, body, headers)
+            except (OSError, asyncio.IncompleteReadError):
+                self.nodes.mark_dead(host)
+                if attempt == attempts - 1:
+                    raise
+                continue
+            finally:
+                self.nodes.release(host)
+            self.nodes.mark_live(host)
+            return resp
+
+    async def _request(self, method, path, data=None, params=None):
+        if self._discover:
+            self._discover = False
+            await self.discover_nodes()
+
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+            status, headers, body = await self._request_node(method, path, data=data, params=params)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(status)
+            if self.compression is not None:
+                encoding = headers.get('content-encoding', '').strip().lower()
+                if encoding in ('gzip', 'deflate'):
+                    body = decompress(body, encoding)
+            if status < 400:
+                return self.codec.loads(body)
+
+            retry = self.retry
+            if retry is not None and attempt + 1 < retry.max_attempts and retry.is_retryable(method, path, status):
+                await asyncio.sleep(retry.delay(attempt, headers.get('retry-after')))
+                attempt += 1
+                continue
+            raise ServerDefinedException(self._error_reason(body))
+
+    async def get(self, path, params=None):
+        """
+        Sends a GET request to Elasticsearch.
+
+        :param path: Path of the verb and resource
+        :param optional params: Dictionary to be sent in the query string.
+        :return: The response as a dictionary.
+
+        >>> print(await client.get('index_name/_search'))
+        """
+        return await self._request('GET', path, params=params)
+
+    async def post(self, path, data, params=None):
+        """
+        Sends a POST request to Elasticsearch.
+
+        :param path: Path of the verb and resource
+        :param dict data: Data to be sent in the body
+        :param optional params: Dictionary to be sent in the query string.
+        :return: The response as a dictionary.
+
+        >>> print(await client.post('index_name/_search', data={"query": {"match_all": {}}}))
+        """
+        return await self._request('POST', path, data=data, params=params)
+
+    async def delete(self, path, data=None, params=None):
+        """
+        Sends a DELETE request to Elasticsearch.
+
+        :param path: Path of the verb and resource
+        :param optional data: Data to be sent in the body
+        :param optional params: Dictionary to be sent in the query string.
+        :return: The response as a dictionary.
+        """
+        return await self._request('DELETE', path, data=data, params=params)
+
+    async def discover_nodes(self):
+        """
+        Replaces the hosts by the HTTP addresses of the nodes of the cluster, see :meth:`RestClient.discover_nodes`.
+        """
+        return self._set_discovered_nodes(await self.get('_nodes/http'))
+
+    def post_stream(self, path, data, params=None):
+        raise NotImplementedError('streaming is not supported by AsyncRestClient')
+
+
+def _client_of(df):
+    if df._async_client is not None:
+        return df._async_client
+    if df._client is None:
+        raise DataFrameException('DataFrame is not bound to ES index')
+    if not isinstance(df._client, RestClient):
+        raise DataFrameException('async operations require an AsyncRestClient')
+    client = _async_clients.get(df._client)
+    if client is None:
+        client = _async_clients[df._client] = AsyncRestClient.from_client(df._client)
+    return client
+
+
+async def aiter_hits(df):
+    """
+    Yields the hits of the search of a :class:`DataFrame <pandasticsearch.dataframe.DataFrame>`,
+    no more than ``limit`` hits in total.
+    """
+    if df._pagination != 'scroll':
+        raise DataFrameException('Not support pagination in async operations: {0}'.format(df._pagination))
+
+    client = _client_of(df)
+    path = df._search_path()
+    query = df._build_query()
+    if df._limit <= query['size']:
+        # all the hits fit in one page, no need to keep a scroll context
+        resp = await client.post(path, data=query)
+        for hit in resp['hits']['hits'][:df._limit]:
+            yield hit
+        return
+
+    row_counter = 0
+    scroll_id = None
+    try:
+        resp = await client.post(path, data=query, params={'scroll': df._scroll_keepalive})
+        while True:
+            scroll_id = resp.get('_scroll_id', scroll_id)
+            hits = resp['hits']['hits']
+            for hit in hits[:df._limit - row_counter]:
+                row_counter += 1
+                yield hit
+            if not scroll_id or not hits or row_counter >= df._limit:
+                break
+            resp = await client.post('_search/scroll', {'scroll_id': scroll_id, 'scroll': df._scroll_keepalive})
+    finally:
+        if scroll_id:
+            try:
+                await client.delete('_search/scroll', data={'scroll_id': [scroll_id]})
+            except Exception:
+                # best effort: the context may have expired already
+                pass
+
+
+async def aiter_rows(df):
+    """
+    Yields the rows of a :class:`DataFrame <pandasticsearch.dataframe.DataFrame>` as :class:`Row` objects.
+    """
+    select = Select()
+    hits = aiter_hits(df)
+    try:
+        async for hit in hits:
+            yield Row(**select.hit_to_row(hit))
+    finally:
+        await hits.aclose()
+
+
+async def _aagg(df):
+    resp = await _client_of(df).post(df._search_path(), data=df._build_query())
+    return Agg.from_dict(resp)
+
+
+async def acollect(df):
+    if df._aggregation is not None or df._groupby is not None:
+        agg = await _aagg(df)
+        return [Row(**v) for v in agg.result]
+    return [row async for row in aiter_rows(df)]
+
+
+async def ato_pandas(df, columnar=False):
+    if df._aggregation is not None or df._groupby is not None:
+        agg = await _aagg(df)
+        return agg.to_pandas()
+
+    try:
+        import pandas
+    except ImportError:
+        raise NoSuchDependencyException('this method requires pandas library')
+
+    if columnar:
+        builder = ColumnarBuilder(df._get_column_types(), capacity=df.batch_size)
+        async for hit in aiter_hits(df):
+            builder.append(hit)
+        return builder.to_pandas()
+
+    select = Select()
+    return pandas.DataFrame([select.hit_to_row(hit) async for hit in aiter_hits(df)])
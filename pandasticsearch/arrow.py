@@ -0,0 +1,175 @@
+# -*- coding: UTF-8 -*-
+
+import json
+
+import six
+
+from pandasticsearch.errors import NoSuchDependencyException, ParseResultException
+
+_metadata_types = (('_id', 'keyword'), ('_index', 'keyword'), ('_score', 'double'))
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise NoSuchDependencyException('this method requires pyarrow library')
+    return pyarrow
+
+
+def arrow_type(pa, es_type):
+    """
+    Returns the Arrow type of a leaf ES field type.
+
+    Dates are kept as strings, since their format depends on the mapping.
+    """
+    return {
+        'long': pa.int64(),
+        'integer': pa.int32(),
+        'short': pa.int16(),
+        'byte': pa.int8(),
+        'double': pa.float64(),
+        'float': pa.float32(),
+        'half_float': pa.float32(),
+        'scaled_float': pa.float64(),
+        'boolean': pa.bool_(),
+    }.get(es_type, pa.string())
+
+
+def _struct_type(pa, properties):
+    return pa.struct([_field(pa, name, prop) for name, prop in properties.items()])
+
+
+def _field(pa, name, prop):
+    if 'properties' in prop and prop['properties']:
+        t = _struct_type(pa, prop['properties'])
+        if prop.get('type') == 'nested':
+            t = pa.list_(t)
+        return pa.field(name, t)
+    return pa.field(name, arrow_type(pa, prop.get('type')))
+
+
+def _flatten(properties, prefix=''):
+    fields = []
+    for name, prop in properties.items():
+        if 'properties' in prop and prop['properties'] and prop.get('type') != 'nested':
+            fields.extend(_flatten(prop['properties'], prefix + name + '.'))
+        else:
+            fields.append((prefix + name, prop))
+    return fields
+
+
+def _projected(name, projection):
+    if projection is None:
+        return True
+    return any(name == p or name.startswith(p + '.') or p.startswith(name + '.') for p in projection)
+
+
+def arrow_schema(properties, projection=None, nested='flatten', metadata=('_id', '_index', '_score')):
+    """
+    Builds the Arrow schema of the documents from the properties of an index mapping.
+
+    :param dict properties: The ``properties`` of the mapping
+    :param list projection: Names of the projected columns, all the columns if None
+    :param str nested: 'flatten' for one column per leaf field (e.g. 'c.d'), or 'struct' for struct columns.
+        Fields of ``nested`` type are always lists of structs.
+    :param metadata: Names of the hit metadata columns
+    :return: ``pyarrow.Schema``
+    """
+    pa = _import_pyarrow()
+    if nested not in ('flatten', 'struct'):
+        raise ValueError('nested is supposed to be flatten or struct: {0}'.format(nested))
+
+    fields = [pa.field(name, arrow_type(pa, es_type)) for name, es_type in _metadata_types if name in metadata]
+    if nested == 'flatten':
+        items = _flatten(properties)
+    else:
+        items = list(properties.items())
+    for name, prop in sorted(items, key=lambda x: x[0]):
+        if _projected(name, projection):
+            fields.append(_field(pa, name, prop))
+    return pa.schema(fields)
+
+
+class ArrowBatchBuilder(object):
+    """
+    Builds ``pyarrow.RecordBatch`` objects of a fixed schema straight from search hits.
+
+    No more than ``batch_rows`` rows are buffered, so the memory is bounded by one batch.
+
+    >>> builder = ArrowBatchBuilder(schema, batch_rows=10000)
+    >>> for batch in builder.batches(hits):
+    ...     writer.write_batch(batch)
+    """
+
+    def __init__(self, schema, batch_rows=10000, nested='flatten'):
+        self._pa = _import_pyarrow()
+        self.schema = schema
+        self._batch_rows = batch_rows
+        self._nested = nested
+        self._names = schema.names
+        self._checks = [self._check_of(f.type) for f in schema]
+
+    def _check_of(self, t):
+        types = self._pa.types
+        if types.is_integer(t):
+            return lambda v: isinstance(v, six.integer_types) and not isinstance(v, bool)
+        if types.is_string(t):
+            return lambda v: isinstance(v, six.string_types)
+        return None
+
+    def _row(self, hit):
+        values = {}
+        for k, v in hit.items():
+            if k == '_source':
+                if self._nested == 'flatten':
+                    _flatten_source(v, '', values)
+                else:
+                    values.update(v)
+            else:
+                values[k] = v
+        return values
+
+    def _batch(self, columns):
+        arrays = []
+        for field, values in zip(self.schema, columns):
+            try:
+                arrays.append(self._pa.array(values, type=field.type))
+            except (self._pa.ArrowInvalid, self._pa.ArrowTypeError, TypeError, ValueError, OverflowError):
+                raise ParseResultException('Values of column {0} do not fit {1}'.format(field.name, field.type))
+        return self._pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def batches(self, hits):
+        """
+        Yields the record batches of the hits.
+        """
+        columns = [[] for _ in self._names]
+        size = 0
+        for hit in hits:
+            row = self._row(hit)
+            for i, name in enumerate(self._names):
+                v = row.get(name)
+                check = self._checks[i]
+                if v is not None and check is not None and not check(v):
+                    if self._pa.types.is_string(self.schema[i].type):
+                        # e.g. a multi-valued keyword field
+                        v = json.dumps(v)
+                    else:
+                        raise ParseResultException('Value {0!r} of column {1} does not fit {2}'.format(
+                            v, name, self.schema[i].type))
+                columns[i].append(v)
+            size += 1
+            if size == self._batch_rows:
+                yield self._batch(columns)
+                columns = [[] for _ in self._names]
+                size = 0
+        if size > 0:
+            yield self._batch(columns)
+
+
+def _flatten_source(source, prefix, values):
+    for k, v in source.items():
+        if isinstance(v, dict):
+            _flatten_source(v, prefix + k + '.', values)
+        else:
+            values[prefix + k] = v
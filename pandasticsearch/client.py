@@ -1,43 +1,244 @@
 # -*- coding: UTF-8 -*-
 
-import json
 import sys
 import base64
+import socket
 import ssl
+from six.moves import http_client
 from six.moves import urllib
 
+from pandasticsearch.codec import JsonCodec, get_codec
+from pandasticsearch.compression import DecompressingResponse, accept_encoding, check_encoding, compress, \
+    content_encoding
 from pandasticsearch.errors import ServerDefinedException
+from pandasticsearch.nodes import NodePool
+from pandasticsearch.streaming import SearchResponseStream
+
+# errors of a node which could not be reached, as opposed to an error response
+_connection_errors = (urllib.error.URLError, socket.error, http_client.HTTPException)
 
 
 class RestClient(object):
     """
     RestClient talks to Elasticsearch cluster through native RESTful API.
+
+    The requests can be spread across several nodes, a node which can not be reached is
+    left out for a while and the request goes on with the next node:
+
+    >>> client = RestClient(['http://es1:9200', 'http://es2:9200'], selector='least_in_flight')
     """
 
-    def __init__(self, host, username=None, password=None, verify_ssl=True):
+    def __init__(self, host, username=None, password=None, verify_ssl=True, pool=None, codec=None,
+                 selector='round_robin', dead_timeout=60, discover_nodes=False, retry=None, circuit_breaker=None,
+                 compression=None):
         """
         Initialize the RESTful from the keyword arguments.
 
-        :param str host: Host URL of Broker node in the Elasticsearch cluster
+        :param host: Host URL of Broker node in the Elasticsearch cluster, or a list of host URLs
         :param str optional username: Username for authentication
         :param str optional password: Password for authentication
         :param bool optional verify_ssl: Whether or not verify the SSL certificate
+        :param optional pool: :class:`ConnectionPool <pandasticsearch.connection.ConnectionPool>` to reuse
+            keep-alive connections. A new connection is opened for each request if not given.
+        :param optional codec: :class:`JsonCodec <pandasticsearch.codec.JsonCodec>` or its name encoding and
+            decoding the bodies (default: the fastest of orjson, simdjson, ujson and json installed)
+        :param str optional selector: How the node of a request is chosen among several hosts,
+            'round_robin' (default) or 'least_in_flight'
+        :param float optional dead_timeout: Seconds during which a node which could not be reached is left out
+        :param bool optional discover_nodes: Whether to replace the hosts by the nodes of the cluster
+            (see :meth:`discover_nodes`) before the first request
+        :param optional retry: :class:`RetryPolicy <pandasticsearch.retry.RetryPolicy>` sending again the requests
+            which got an overload response (429, 502, 503 or 504). No request is retried if not given.
+        :param optional circuit_breaker: :class:`CircuitBreaker <pandasticsearch.retry.CircuitBreaker>` failing
+            the requests at once while the cluster keeps answering that it is overloaded
+        :param str optional compression: 'gzip' or 'deflate' to compress the request bodies and ask for
+            compressed responses, which are decompressed while they are read (default: no compression)
         """
-        self.host = host
+        self.nodes = NodePool(host, selector=selector, dead_timeout=dead_timeout)
+        self._discover = discover_nodes
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.compression = check_encoding(compression)
         self.username = username
         self.password = password
         self.verify_ssl = verify_ssl
+        self.pool = pool
+        self.codec = codec if isinstance(codec, JsonCodec) else get_codec(codec)
+
+    @property
+    def host(self):
+        """
+        The first host of the client.
+        """
+        return self.nodes.hosts[0]
 
-    def _prepare_url(self, path):
-        if self.host.endswith('/'):
-            url = self.host + path
+    def _prepare_url(self, path, host=None):
+        host = host or self.host
+        if host.endswith('/'):
+            url = host + path
         else:
             if path.startswith('/'):
-                url = self.host + path
+                url = host + path
             else:
-                url = self.host + '/' + path
+                url = host + '/' + path
         return url
 
+    def _urlopen(self, method, url, body=None, headers=None):
+        context = None
+        if self.verify_ssl is False:
+            context = ssl._create_unverified_context()
+
+        if self.pool is not None:
+            res = self.pool.urlopen(method, url, body=body, headers=headers, context=context)
+            if res.status >= 400:
+                raise urllib.error.HTTPError(url, res.status, res.reason, res.msg, res)
+            return self._decompressed(res)
+
+        req = urllib.request.Request(url=url, data=body, headers=headers or {})
+        req.get_method = lambda: method
+        if context is not None:
+            return self._decompressed(urllib.request.urlopen(req, context=context))
+        return self._decompressed(urllib.request.urlopen(req))
+
+    def _decompressed(self, res):
+        if self.compression is None:
+            return res
+        encoding = content_encoding(res)
+        if encoding is None:
+            return res
+        return DecompressingResponse(res, encoding)
+
+    def _prepare_request(self, path, data=None, params=None, host=None):
+        """
+        Returns the URL, the encoded body and the headers of a request.
+        """
+        url = self._prepare_url(path, host)
+        username = self.username
+        password = self.password
+
+        if params is not None:
+            url = '{0}?{1}'.format(url, urllib.parse.urlencode(params))
+
+        headers = {}
+        body = None
+        if data is not None:
+            body = self.codec.dumps(data)
+            headers['Content-Type'] = 'application/json'
+            if self.compression is not None:
+                body = compress(body, self.compression)
+                headers['Content-Encoding'] = self.compression
+
+        if self.compression is not None:
+            headers['Accept-Encoding'] = accept_encoding
+
+        if username is not None and password is not None:
+            s = '%s:%s' % (username, password)
+            base64creds = base64.b64encode(s.encode('utf-8')).decode('utf-8')
+            headers['Authorization'] = "Basic %s" % base64creds
+        return url, body, headers
+
+    def _error_reason(self, body):
+        try:
+            reason = self.codec.loads(body)
+        except (ValueError, AttributeError, KeyError):
+            return None
+        if isinstance(reason, dict):
+            return reason.get('error', None)
+        return None
+
+    def _open_node(self, method, path, data=None, params=None):
+        """
+        Sends a request to the next node, and to the following ones while they can not be reached.
+        """
+        attempts = len(self.nodes)
+        for attempt in range(attempts):
+            host = self.nodes.acquire()
+            try:
+                url, body, headers = self._prepare_request(path, data=data, params=params, host=host)
+                res = self._urlopen(method, url, body=body, headers=headers)
+            except urllib.error.HTTPError:
+                # the node has answered
+                self.nodes.mark_live(host)
+                raise
+            except _connection_errors:
+                self.nodes.mark_dead(host)
+                if attempt == attempts - 1:
+                    raise
+                continue
+            finally:
+                self.nodes.release(host)
+            self.nodes.mark_live(host)
+            return res
+
+    def _open(self, method, path, data=None, params=None):
+        if self._discover:
+            self._discover = False
+            self.discover_nodes()
+
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+            try:
+                res = self._open_node(method, path, data=data, params=params)
+            except urllib.error.HTTPError:
+                _, e, _ = sys.exc_info()
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record(e.code)
+                reason = None
+                if e.code != 200:
+                    try:
+                        reason = self._error_reason(self._decompressed(e).read())
+                    except AttributeError:
+                        pass
+
+                retry = self.retry
+                if retry is not None and attempt + 1 < retry.max_attempts and retry.is_retryable(method, path, e.code):
+                    headers = e.info() or {}
+                    retry.sleep(retry.delay(attempt, headers.get('Retry-After')))
+                    attempt += 1
+                    continue
+
+                raise ServerDefinedException(reason)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_success()
+            return res
+
+    def discover_nodes(self):
+        """
+        Replaces the hosts by the HTTP addresses of the nodes of the cluster, read from ``_nodes/http``.
+
+        The scheme of the current hosts is kept.
+
+        :return: The list of the discovered hosts
+
+        >>> client = RestClient('http://es1:9200')
+        >>> client.discover_nodes()
+        ['http://10.0.0.1:9200', 'http://10.0.0.2:9200']
+        """
+        return self._set_discovered_nodes(self.get('_nodes/http'))
+
+    def _set_discovered_nodes(self, resp):
+        scheme = urllib.parse.urlsplit(self.host).scheme or 'http'
+        hosts = []
+        for node in resp.get('nodes', {}).values():
+            address = node.get('http', {}).get('publish_address')
+            if not address:
+                continue
+            if '/' in address:
+                # e.g. 'es1.example.com/10.0.0.1:9200'
+                address = address.split('/', 1)[1]
+            hosts.append('{0}://{1}'.format(scheme, address))
+        if hosts:
+            self.nodes.set_hosts(sorted(hosts))
+        return self.nodes.hosts
+
+    def _request(self, method, path, data=None, params=None):
+        res = self._open(method, path, data=data, params=params)
+        data = res.read()
+        res.close()
+        return self.codec.loads(data)
+
     def get(self, path, params=None):
         """
         Sends a GET request to Elasticsearch.
@@ -50,44 +251,7 @@ class RestClient(object):
         >>> client = RestClient('http://host:port')
         >>> print(client.get('index_name/_search'))
         """
-        try:
-            url = self._prepare_url(path)
-            username = self.username
-            password = self.password
-            verify_ssl = self.verify_ssl
-
-            if params is not None:
-                url = '{0}?{1}'.format(url, urllib.parse.urlencode(params))
-
-            req = urllib.request.Request(url=url)
-
-            if username is not None and password is not None:
-                s = '%s:%s' % (username, password)
-                base64creds = base64.b64encode(s.encode('utf-8')).decode('utf-8')
-                req.add_header("Authorization", "Basic %s" % base64creds)
-            
-            if verify_ssl is False:
-                context = ssl._create_unverified_context()
-                res = urllib.request.urlopen(req, context=context)
-            else:
-                res = urllib.request.urlopen(req)
-
-            data = res.read().decode("utf-8")
-            res.close()
-        except urllib.error.HTTPError:
-            _, e, _ = sys.exc_info()
-            reason = None
-            if e.code != 200:
-                try:
-                    reason = json.loads(e.read().decode("utf-8"))
-                except (ValueError, AttributeError, KeyError):
-                    pass
-                else:
-                    reason = reason.get('error', None)
-
-            raise ServerDefinedException(reason)
-        else:
-            return json.loads(data)
+        return self._request('GET', path, params=params)
 
     def post(self, path, data, params=None):
         """
@@ -102,42 +266,36 @@ class RestClient(object):
         >>> client = RestClient('http://host:port')
         >>> print(client.post(path='index/_search', data={"query":{"match_all":{}}}))
         """
-        try:
-            url = self._prepare_url(path)
-            username = self.username
-            password = self.password
-            verify_ssl = self.verify_ssl
-
-            if params is not None:
-                url = '{0}?{1}'.format(url, urllib.parse.urlencode(params))
-
-            req = urllib.request.Request(url=url, data=json.dumps(data).encode('utf-8'),
-                                         headers={'Content-Type': 'application/json'})
-
-            if username is not None and password is not None:
-                s = '%s:%s' % (username, password)
-                base64creds = base64.b64encode(s.encode('utf-8')).decode('utf-8')
-                req.add_header("Authorization", "Basic %s" % base64creds)
-            
-            if verify_ssl is False:
-                context = ssl._create_unverified_context()
-                res = urllib.request.urlopen(req, context=context)
-            else:
-                res = urllib.request.urlopen(req)
-
-            data = res.read().decode("utf-8")
-            res.close()
-        except urllib.error.HTTPError:
-            _, e, _ = sys.exc_info()
-            reason = None
-            if e.code != 200:
-                try:
-                    reason = json.loads(e.read().decode("utf-8"))
-                except (ValueError, AttributeError, KeyError):
-                    pass
-                else:
-                    reason = reason.get('error', None)
-
-            raise ServerDefinedException(reason)
-        else:
-            return json.loads(data)
+        return self._request('POST', path, data=data, params=params)
+
+    def post_stream(self, path, data, params=None):
+        """
+        Sends a POST search request to Elasticsearch and decodes the hits one by one while reading the response.
+
+        :param path: The path of the verb and resource, e.g. "/index_name/_search"
+        :param data: The json data to send in the body of the request.
+        :param optional params: Dictionary to be sent in the query string.
+        :return: :class:`SearchResponseStream <pandasticsearch.streaming.SearchResponseStream>`
+
+        >>> from pandasticsearch import RestClient
+        >>> client = RestClient('http://host:port')
+        >>> stream = client.post_stream(path='index/_search', data={"query":{"match_all":{}}})
+        >>> for hit in stream.hits():
+        ...     print(hit)
+        """
+        return SearchResponseStream(self._open('POST', path, data=data, params=params))
+
+    def delete(self, path, data=None, params=None):
+        """
+        Sends a DELETE request to Elasticsearch.
+
+        :param path: The path of the verb and resource, e.g. "_search/scroll"
+        :param optional data: The json data to send in the body of the request.
+        :param optional params: Dictionary to be sent in the query string.
+        :return: The response as a dictionary.
+
+        >>> from pandasticsearch import RestClient
+        >>> client = RestClient('http://host:port')
+        >>> print(client.delete(path='_search/scroll', data={"scroll_id": ["..."]}))
+        """
+        return self._request('DELETE', path, data=data, params=params)
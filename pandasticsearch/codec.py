@@ -0,0 +1,90 @@
+# -*- coding: UTF-8 -*-
+
+import json
+
+from pandasticsearch.errors import NoSuchDependencyException
+
+
+class JsonCodec(object):
+    """
+    Encodes request bodies and decodes response bodies with the standard json library.
+
+    A codec works directly on bytes: :meth:`dumps` returns bytes and :meth:`loads` accepts bytes.
+    """
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj).encode('utf-8')
+
+    def loads(self, data):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+
+class SimdjsonCodec(JsonCodec):
+    """
+    Decodes with pysimdjson, which has no encoder of its own.
+    """
+    name = 'simdjson'
+
+    def __init__(self):
+        import simdjson
+        self._simdjson = simdjson
+
+    def loads(self, data):
+        return self._simdjson.loads(data)
+
+
+# in order of preference when auto-detecting
+_codecs = (OrjsonCodec, SimdjsonCodec, UjsonCodec, JsonCodec)
+
+
+def get_codec(name=None):
+    """
+    Returns a codec by its name, or the fastest one installed if ``name`` is not given.
+
+    :param str optional name: One of 'orjson', 'simdjson', 'ujson' and 'json'
+    :return: :class:`JsonCodec <JsonCodec>`
+
+    >>> from pandasticsearch.codec import get_codec
+    >>> get_codec().name
+    'orjson'
+    """
+    for cls in _codecs:
+        if name is not None and cls.name != name:
+            continue
+        try:
+            return cls()
+        except ImportError:
+            if name is not None:
+                raise NoSuchDependencyException('{0} codec requires {0} library'.format(name))
+    raise ValueError('Unknown codec: {0}'.format(name))
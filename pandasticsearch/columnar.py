@@ -0,0 +1,209 @@
+# -*- coding: UTF-8 -*-
+
+from collections import OrderedDict
+import numbers
+
+import six
+
+from pandasticsearch.errors import NoSuchDependencyException
+
+_int_types = ('long', 'integer', 'short', 'byte')
+_float_types = ('double', 'float', 'half_float', 'scaled_float')
+_bool_types = ('boolean',)
+_date_types = ('date', 'date_nanos')
+
+_numpy_dtypes = {
+    'int64': 'int64',
+    'float64': 'float64',
+    'bool': 'bool',
+    'datetime64': 'object',  # parsed once all the values are known
+    'object': 'object',
+}
+
+
+def column_kind(es_type):
+    """
+    Returns the kind of column buffer ('int64', 'float64', 'bool', 'datetime64' or 'object') of an ES field type.
+    """
+    if es_type in _int_types:
+        return 'int64'
+    if es_type in _float_types:
+        return 'float64'
+    if es_type in _bool_types:
+        return 'bool'
+    if es_type in _date_types:
+        return 'datetime64'
+    return 'object'
+
+
+def _accepts(kind, value):
+    if kind == 'int64':
+        return isinstance(value, six.integer_types) and not isinstance(value, bool) \
+            and -2 ** 63 <= value < 2 ** 63
+    if kind == 'float64':
+        return isinstance(value, (float, six.integer_types)) and not isinstance(value, bool)
+    if kind == 'bool':
+        return isinstance(value, bool)
+    return True
+
+
+class _Column(object):
+    __slots__ = ('kind', 'start', 'chunks', 'values', 'mask', '_numpy')
+
+    def __init__(self, numpy, kind, capacity, start):
+        self._numpy = numpy
+        self.kind = kind
+        self.start = start  # number of rows before the first chunk
+        self.chunks = []
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        numpy = self._numpy
+        if _numpy_dtypes[self.kind] == 'object':
+            self.values = numpy.empty(capacity, dtype=object)
+        else:
+            self.values = numpy.zeros(capacity, dtype=_numpy_dtypes[self.kind])
+        self.mask = numpy.zeros(capacity, dtype=bool)
+
+    def set(self, i, value):
+        if value is None:
+            return
+        if not _accepts(self.kind, value):
+            # e.g. a multi-valued field or a value of another type in _source
+            self._to_object()
+        self.values[i] = value
+        self.mask[i] = True
+
+    def _to_object(self):
+        def convert(values, mask):
+            converted = values.astype(object)
+            converted[~mask] = None
+            return converted
+
+        self.chunks = [(convert(values, mask), mask) for values, mask in self.chunks]
+        self.values = convert(self.values, self.mask)
+        self.kind = 'object'
+
+    def flush(self, capacity):
+        self.chunks.append((self.values, self.mask))
+        self._alloc(capacity)
+
+    def finish(self, size):
+        """
+        Returns the column of ``size`` rows as a numpy array, missing values as NaN/None.
+        """
+        numpy = self._numpy
+        chunks = self.chunks + [(self.values, self.mask)]
+        values = numpy.concatenate([v for v, _ in chunks])[:size - self.start]
+        mask = numpy.concatenate([m for _, m in chunks])[:size - self.start]
+        if self.start > 0:
+            if values.dtype == object:
+                values = numpy.concatenate([numpy.empty(self.start, dtype=object), values])
+            else:
+                values = numpy.concatenate([numpy.zeros(self.start, dtype=values.dtype), values])
+            mask = numpy.concatenate([numpy.zeros(self.start, dtype=bool), mask])
+
+        if mask.all():
+            return values
+        if self.kind in ('int64', 'float64'):
+            values = values.astype('float64')
+            values[~mask] = numpy.nan
+        elif self.kind == 'bool':
+            values = values.astype(object)
+            values[~mask] = None
+        return values
+
+
+class ColumnarBuilder(object):
+    """
+    Builds typed columns directly from search hits, instead of a list of row dictionaries.
+
+    The buffers of the columns are preallocated by page (int64/float64/bool/object) according to
+    the types in the index mapping. A column falls back to object if a value doesn't fit its type
+    (e.g. an array). Int columns with missing values become float64 and date columns are parsed
+    into datetime64 when possible, as pandas would do.
+
+    >>> builder = ColumnarBuilder({'age': 'integer', 'name': 'keyword'})
+    >>> for hit in hits:
+    ...     builder.append(hit)
+    >>> builder.to_pandas()
+    """
+
+    def __init__(self, column_types=None, capacity=5000):
+        """
+        :param dict column_types: ES field types by (flattened) column name
+        :param int capacity: Number of rows allocated at a time, e.g. the size of a page
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise NoSuchDependencyException('this method requires numpy library')
+        self._numpy = numpy
+        self._types = column_types or {}
+        self._capacity = max(int(capacity), 1)
+        self._columns = OrderedDict()
+        self._size = 0  # rows in the flushed chunks
+        self._row = 0  # row in the current chunk
+
+    def __len__(self):
+        return self._size + self._row
+
+    def append(self, hit):
+        if self._row == self._capacity:
+            self._flush()
+        for k, v in hit.items():
+            if k == '_source':
+                self._put_source(v, '')
+            elif k.startswith('_'):
+                self._put(k, v)
+        self._row += 1
+
+    def _flush(self):
+        for col in self._columns.values():
+            col.flush(self._capacity)
+        self._size += self._row
+        self._row = 0
+
+    def _put_source(self, source, prefix):
+        for k, v in source.items():
+            if isinstance(v, dict):
+                self._put_source(v, prefix + k + '.')
+            else:
+                self._put(prefix + k, v)
+
+    def _put(self, name, value):
+        col = self._columns.get(name)
+        if col is None:
+            kind = column_kind(self._types.get(name))
+            col = self._columns[name] = _Column(self._numpy, kind, self._capacity, self._size)
+        col.set(self._row, value)
+
+    def columns(self):
+        """
+        Returns the columns as an ordered dictionary of numpy arrays.
+        """
+        size = len(self)
+        return OrderedDict((name, col.finish(size)) for name, col in self._columns.items())
+
+    def to_pandas(self):
+        try:
+            import pandas
+        except ImportError:
+            raise NoSuchDependencyException('this method requires pandas library')
+
+        columns = self.columns()
+        for name, col in self._columns.items():
+            if col.kind == 'datetime64':
+                columns[name] = _to_datetime(pandas, columns[name])
+        return pandas.DataFrame(columns, columns=list(columns.keys()), index=pandas.RangeIndex(len(self)))
+
+
+def _to_datetime(pandas, values):
+    present = [v for v in values if v is not None]
+    try:
+        if present and all(isinstance(v, numbers.Number) for v in present):
+            return pandas.to_datetime(values, unit='ms', utc=True)
+        return pandas.to_datetime(values, utc=True)
+    except (ValueError, TypeError, OverflowError):
+        # custom date formats are kept as they are
+        return values
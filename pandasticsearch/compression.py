@@ -0,0 +1,121 @@
+# -*- coding: UTF-8 -*-
+
+import zlib
+
+_encodings = ('gzip', 'deflate')
+
+# header of the responses the client is able to decode
+accept_encoding = 'gzip, deflate'
+
+
+def check_encoding(encoding):
+    if encoding is not None and encoding not in _encodings:
+        raise ValueError('compression is supposed to be gzip or deflate: {0}'.format(encoding))
+    return encoding
+
+
+def compress(data, encoding, level=6):
+    """
+    Compresses a request body with 'gzip' or 'deflate' (zlib format).
+    """
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    else:
+        compressor = zlib.compressobj(level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def content_encoding(response):
+    """
+    Returns the compression of a response, or None if the body is not compressed.
+    """
+    headers = response.info() if hasattr(response, 'info') else getattr(response, 'headers', None)
+    if headers is None:
+        return None
+    encoding = (headers.get('Content-Encoding') or '').strip().lower()
+    if encoding in _encodings:
+        return encoding
+    return None
+
+
+class _Decompressor(object):
+    def __init__(self, encoding):
+        # gzip and zlib streams are told apart by their header
+        self._obj = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        self._raw = encoding == 'deflate'
+        self._started = False
+
+    def decompress(self, data):
+        if not self._started and data:
+            self._started = True
+            try:
+                return self._obj.decompress(data)
+            except zlib.error:
+                if not self._raw:
+                    raise
+                # some servers send deflate without the zlib header
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+
+def decompress(data, encoding):
+    """
+    Decompresses a whole response body.
+    """
+    decompressor = _Decompressor(encoding)
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+class DecompressingResponse(object):
+    """
+    Decompresses the body of a response while it is read, so that only a chunk of the compressed
+    body is buffered at a time.
+
+    It has the ``read(n)`` and ``close()`` methods of the wrapped response, ``read(n)`` returning
+    no more than ``n`` decompressed bytes.
+    """
+
+    def __init__(self, response, encoding, chunk_size=64 * 1024):
+        """
+        :param response: A file-like object with ``read(n)`` and ``close()``
+        :param str encoding: 'gzip' or 'deflate'
+        :param int chunk_size: Number of compressed bytes read at a time
+        """
+        self._response = response
+        self._decompressor = _Decompressor(encoding)
+        self._chunk_size = chunk_size
+        self._buf = b''
+        self._eof = False
+
+    def __getattr__(self, name):
+        # status, headers, getheader...
+        return getattr(self._response, name)
+
+    def _fill(self):
+        data = self._response.read(self._chunk_size)
+        if not data:
+            self._eof = True
+            self._buf += self._decompressor.flush()
+        else:
+            self._buf += self._decompressor.decompress(data)
+
+    def read(self, amt=None):
+        if amt is None:
+            chunks = [self._buf]
+            self._buf = b''
+            while not self._eof:
+                self._fill()
+                chunks.append(self._buf)
+                self._buf = b''
+            return b''.join(chunks)
+
+        while len(self._buf) < amt and not self._eof:
+            self._fill()
+        data, self._buf = self._buf[:amt], self._buf[amt:]
+        return data
+
+    def close(self):
+        self._response.close()
@@ -0,0 +1,184 @@
+# -*- coding: UTF-8 -*-
+
+import socket
+import threading
+import time
+from collections import deque
+
+from six.moves import http_client
+from six.moves import urllib
+
+
+class PooledResponse(object):
+    """
+    A thin wrapper of the HTTP response which gives the underlying connection back to
+    its :class:`ConnectionPool <ConnectionPool>` once the body is fully read.
+    """
+
+    def __init__(self, pool, key, conn, response):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._response = response
+
+    @property
+    def status(self):
+        return self._response.status
+
+    @property
+    def reason(self):
+        return self._response.reason
+
+    @property
+    def msg(self):
+        return self._response.msg
+
+    headers = msg
+
+    def info(self):
+        return self._response.msg
+
+    def getheader(self, name, default=None):
+        return self._response.getheader(name, default)
+
+    def read(self, amt=None):
+        data = self._response.read(amt)
+        if self._response.isclosed():
+            self._release()
+        return data
+
+    def close(self):
+        if self._conn is None:
+            return
+        if not self._response.isclosed():
+            # The body was not consumed, the connection can not be reused
+            self._response.close()
+            self._conn.close()
+            self._conn = None
+        else:
+            self._release()
+
+    def _release(self):
+        if self._conn is None:
+            return
+        if self._response.will_close:
+            self._conn.close()
+        else:
+            self._pool._put_conn(self._key, self._conn)
+        self._conn = None
+
+
+class ConnectionPool(object):
+    """
+    ConnectionPool keeps HTTP/1.1 keep-alive connections open for each host, so that
+    consecutive requests (e.g. the pages of a scroll) reuse the same TCP connection and TLS session.
+
+    It is thread-safe and can be shared by several :class:`RestClient <pandasticsearch.client.RestClient>` objects.
+
+    >>> from pandasticsearch.client import RestClient
+    >>> from pandasticsearch.connection import ConnectionPool
+    >>> client = RestClient('http://host:port', pool=ConnectionPool(maxsize=10, idle_timeout=60))
+    """
+
+    def __init__(self, maxsize=10, idle_timeout=60, timeout=None):
+        """
+        :param int maxsize: Max number of idle connections kept for each host
+        :param float idle_timeout: Seconds after which an idle connection is discarded
+        :param float optional timeout: Socket timeout in seconds of each connection
+        """
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split_url(url):
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == 'https' else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path = path + '?' + parts.query
+        return (scheme, parts.hostname, port), path
+
+    def _new_conn(self, key, context=None):
+        scheme, host, port = key
+        kwargs = {}
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        if scheme == 'https':
+            return http_client.HTTPSConnection(host, port, context=context, **kwargs)
+        return http_client.HTTPConnection(host, port, **kwargs)
+
+    def _get_conn(self, key, context=None):
+        """
+        :return: a tuple of (connection, whether it is reused)
+        """
+        now = time.time()
+        expired = []
+        conn = None
+        with self._lock:
+            conns = self._idle.get(key)
+            while conns:
+                # most recently used connections are on the right
+                candidate, last_used = conns.pop()
+                if now - last_used <= self.idle_timeout:
+                    conn = candidate
+                    break
+                expired.append(candidate)
+        for c in expired:
+            c.close()
+        if conn is not None:
+            return conn, True
+        return self._new_conn(key, context), False
+
+    def _put_conn(self, key, conn):
+        with self._lock:
+            conns = self._idle.setdefault(key, deque())
+            if len(conns) < self.maxsize:
+                conns.append((conn, time.time()))
+                return
+        conn.close()
+
+    def urlopen(self, method, url, body=None, headers=None, context=None):
+        """
+        Sends a request through a pooled connection.
+
+        :param str method: HTTP method
+        :param str url: Absolute URL of the request
+        :param bytes optional body: Body of the request
+        :param dict optional headers: Headers of the request
+        :param optional context: The ``ssl.SSLContext`` used by new https connections
+        :return: :class:`PooledResponse <PooledResponse>`
+        """
+        key, path = self._split_url(url)
+        headers = headers or {}
+        conn, reused = self._get_conn(key, context)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+        except (http_client.HTTPException, socket.error):
+            conn.close()
+            if not reused:
+                raise
+            # The server may have closed the idle keep-alive connection, retry on a new one
+            conn = self._new_conn(key, context)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+        return PooledResponse(self, key, conn, response)
+
+    def clear(self):
+        """
+        Closes all the idle connections.
+        """
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
@@ -1,20 +1,47 @@
 # -*- coding: UTF-8 -*-
 
+from pandasticsearch.arrow import ArrowBatchBuilder, arrow_schema
 from pandasticsearch.client import RestClient
-from pandasticsearch.queries import Agg, ScrollSelect
+from pandasticsearch.connection import ConnectionPool
+from pandasticsearch.queries import Agg, ScrollSelect, decode_cursor
 from pandasticsearch.operators import *
 from pandasticsearch.types import Column, Row
-from pandasticsearch.errors import DataFrameException
+from pandasticsearch.errors import DataFrameException, NoSuchDependencyException, ServerDefinedException
 
 import json
 import six
 import sys
 import copy
+import itertools
+import threading
+from six.moves import queue
 
 _unbound_index_err = DataFrameException('DataFrame is not bound to ES index')
 
 _count_aggregator = MetricAggregator('_index', 'value_count', alias='count').build()
 
+# hits per scroll page when batch_size is not specified: min(limit, _max_batch_size)
+_max_batch_size = 5000
+
+_default_scroll_keepalive = '1m'
+
+_paginations = ('scroll', 'pit')
+
+# tiebreaker of search_after within a point in time (ES >= 7.12)
+_pit_tiebreaker = {'_shard_doc': 'asc'}
+
+# marks the end of a slice in the page queue of a sliced scroll
+_slice_done = object()
+
+# keep-alive connections shared by the DataFrames created by from_es()
+_default_pool = ConnectionPool()
+
+
+def _close(hits):
+    # the hits of a streamed response hold the connection until closed
+    if hasattr(hits, 'close'):
+        hits.close()
+
 
 class DataFrame(object):
     """
@@ -46,8 +73,41 @@ class DataFrame(object):
         self._sort = kwargs.get('sort', None)
         self._projection = kwargs.get('projection', None)
         self._limit = kwargs.get('limit', 100)
+        self._batch_size = kwargs.get('batch_size', None)
+        self._scroll_keepalive = kwargs.get('scroll_keepalive', _default_scroll_keepalive)
+        self._pagination = kwargs.get('pagination', 'scroll')
+        self._cursor = kwargs.get('cursor', None)
+        self._streaming = kwargs.get('streaming', False)
+        self._async_client = kwargs.get('async_client', None)
         self._last_query = None
 
+        if self._pagination not in _paginations:
+            raise DataFrameException('Not support pagination: {0}'.format(self._pagination))
+
+    def _copy(self, **kwargs):
+        """
+        Returns a new :class:`DataFrame <DataFrame>` sharing the state of this one except ``kwargs``.
+        """
+        params = dict(client=self._client,
+                      index=self._index,
+                      doc_type=self._doc_type,
+                      mapping=self._mapping,
+                      filter=self._filter,
+                      groupby=self._groupby,
+                      aggregation=self._aggregation,
+                      projection=self._projection,
+                      sort=self._sort,
+                      limit=self._limit,
+                      batch_size=self._batch_size,
+                      scroll_keepalive=self._scroll_keepalive,
+                      pagination=self._pagination,
+                      cursor=self._cursor,
+                      streaming=self._streaming,
+                      async_client=self._async_client,
+                      compat=self._compat)
+        params.update(kwargs)
+        return DataFrame(**params)
+
     @property
     def index(self):
         """
@@ -74,6 +134,15 @@ class DataFrame(object):
         """
         return sorted(self._get_cols(self._mapping)) if self._mapping else None
 
+    @property
+    def batch_size(self):
+        """
+        Returns the number of hits fetched per scroll page.
+        """
+        if self._batch_size is not None:
+            return self._batch_size
+        return min(self._limit, _max_batch_size)
+
     @property
     def schema(self):
         """
@@ -86,15 +155,35 @@ class DataFrame(object):
         """
         Creates an :class:`DataFrame <DataFrame>` object by providing the URL of ElasticSearch node and the name of the index.
 
-        :param str url: URL of the node connected to (default: 'http://localhost:9200')
+        :param url: URL of the node connected to (default: 'http://localhost:9200'), or a list of URLs
+            of nodes across which the requests are spread
+        :param str selector: How the node of a request is chosen among several URLs,
+            'round_robin' (default) or 'least_in_flight'
+        :param bool discover_nodes: Whether to spread the requests across all the nodes of the cluster,
+            read from ``_nodes/http`` (default: False)
+        :param retry: :class:`RetryPolicy <pandasticsearch.retry.RetryPolicy>` of the requests which got an overload
+            response, e.g. a 429 in the middle of a long scroll (default: no retry)
+        :param circuit_breaker: :class:`CircuitBreaker <pandasticsearch.retry.CircuitBreaker>` of the client
+        :param str compression: 'gzip' or 'deflate' to compress the bodies of the requests and the responses,
+            which saves bandwidth on large exports (default: no compression)
         :param str index: The name of the index
         :param str doc_type: The type of the document
         :param str compat: The compatible ES version (an integer number)
+        :param int batch_size: Number of hits fetched per scroll page (default: min(limit, 5000))
+        :param str scroll_keepalive: How long ES keeps the scroll context between two pages (default: '1m')
+        :param str pagination: 'scroll' (default) or 'pit' to page with search_after in a point in time (ES >= 7.12)
+        :param bool streaming: Decode the hits one by one while reading the responses, so that the memory
+            scales with a hit rather than with a page (default: False)
+        :param codec: Name of the JSON codec of the client: 'orjson', 'simdjson', 'ujson' or 'json'
+            (default: the fastest installed)
+        :param pool: :class:`ConnectionPool <pandasticsearch.connection.ConnectionPool>` reusing keep-alive
+            connections (default: a pool shared by all the DataFrames, `None` to open a connection per request)
         :return: DataFrame object for accessing
         :rtype: DataFrame
 
         >>> from pandasticsearch import DataFrame
         >>> df = DataFrame.from_es('http://host:port', index='people')
+        >>> df = DataFrame.from_es(url=['http://host1:port', 'http://host2:port'], index='people')
         """
 
         doc_type = kwargs.get('doc_type', None)
@@ -104,6 +193,17 @@ class DataFrame(object):
         username = kwargs.get('username', None)
         password = kwargs.get('password', None)
         verify_ssl = kwargs.get('verify_ssl', True)
+        pool = kwargs.get('pool', _default_pool)
+        codec = kwargs.get('codec', None)
+        batch_size = kwargs.get('batch_size', None)
+        scroll_keepalive = kwargs.get('scroll_keepalive', _default_scroll_keepalive)
+        pagination = kwargs.get('pagination', 'scroll')
+        streaming = kwargs.get('streaming', False)
+        selector = kwargs.get('selector', 'round_robin')
+        discover_nodes = kwargs.get('discover_nodes', False)
+        retry = kwargs.get('retry', None)
+        circuit_breaker = kwargs.get('circuit_breaker', None)
+        compression = kwargs.get('compression', None)
 
         if index is None:
             raise ValueError('Index name must be specified')
@@ -113,11 +213,15 @@ class DataFrame(object):
         else:
             path = index + '/' + doc_type
 
-        client = RestClient(url, username, password, verify_ssl)
+        client = RestClient(url, username, password, verify_ssl, pool=pool, codec=codec, selector=selector,
+                            discover_nodes=discover_nodes, retry=retry, circuit_breaker=circuit_breaker,
+                            compression=compression)
 
         mapping = client.get(path)
 
-        return DataFrame(client=client, mapping=mapping, index=index, doc_type=doc_type, compat=compat)
+        return DataFrame(client=client, mapping=mapping, index=index, doc_type=doc_type, compat=compat,
+                         batch_size=batch_size, scroll_keepalive=scroll_keepalive, pagination=pagination,
+                         streaming=streaming)
 
     def __getattr__(self, name):
         """
@@ -162,17 +266,7 @@ class DataFrame(object):
         if self._filter is not None:
             _filter = (self._filter & _filter)
 
-        return DataFrame(client=self._client,
-                         index=self._index,
-                         doc_type=self._doc_type,
-                         mapping=self._mapping,
-                         filter=_filter,
-                         groupby=self._groupby,
-                         aggregation=self._aggregation,
-                         projection=self._projection,
-                         sort=self._sort,
-                         limit=self._limit,
-                         compat=self._compat)
+        return self._copy(filter=_filter)
 
     where = filter
 
@@ -193,17 +287,7 @@ class DataFrame(object):
                 projection.append(col)
             else:
                 raise TypeError('{0} is supposed to be str or Column'.format(col))
-        return DataFrame(client=self._client,
-                         index=self._index,
-                         doc_type=self._doc_type,
-                         mapping=self._mapping,
-                         filter=self._filter,
-                         groupby=self._groupby,
-                         aggregation=self._aggregation,
-                         projection=projection,
-                         sort=self._sort,
-                         limit=self._limit,
-                         compat=self._compat)
+        return self._copy(projection=projection)
 
     def limit(self, num):
         """
@@ -211,17 +295,7 @@ class DataFrame(object):
         """
         assert isinstance(num, int)
         assert num >= 1
-        return DataFrame(client=self._client,
-                         index=self._index,
-                         doc_type=self._doc_type,
-                         mapping=self._mapping,
-                         filter=self._filter,
-                         groupby=self._groupby,
-                         aggregation=self._aggregation,
-                         projection=self._projection,
-                         sort=self._sort,
-                         limit=num,
-                         compat=self._compat)
+        return self._copy(limit=num)
 
     def groupby(self, *cols):
         """
@@ -243,17 +317,7 @@ class DataFrame(object):
             names = [col.field_name() for col in columns]
             groupby = Grouper.from_list(names).build()
 
-        return DataFrame(client=self._client,
-                         index=self._index,
-                         doc_type=self._doc_type,
-                         mapping=self._mapping,
-                         filter=self._filter,
-                         groupby=groupby,
-                         aggregation=self._aggregation,
-                         projection=self._projection,
-                         sort=self._sort,
-                         limit=self.limit,
-                         compat=self._compat)
+        return self._copy(groupby=groupby)
 
     def agg(self, *aggs):
         """
@@ -269,17 +333,7 @@ class DataFrame(object):
             assert isinstance(agg, Aggregator)
             aggregation.update(agg.build())
 
-        return DataFrame(client=self._client,
-                         index=self._index,
-                         doc_type=self._doc_type,
-                         mapping=self._mapping,
-                         filter=self._filter,
-                         groupby=self._groupby,
-                         aggregation=aggregation,
-                         projection=self._projection,
-                         sort=self._sort,
-                         limit=self._limit,
-                         compat=self._compat)
+        return self._copy(aggregation=aggregation)
 
     def sort(self, *cols):
         """
@@ -301,88 +355,346 @@ class DataFrame(object):
             else:
                 raise TypeError('{0} is supposed to be str or Sorter'.format(col))
 
-        return DataFrame(client=self._client,
-                         index=self._index,
-                         doc_type=self._doc_type,
-                         mapping=self._mapping,
-                         filter=self._filter,
-                         groupby=self._groupby,
-                         aggregation=self._aggregation,
-                         projection=self._projection,
-                         sort=sorts,
-                         limit=self._limit,
-                         compat=self._compat)
+        return self._copy(sort=sorts)
 
     orderby = sort
 
-    def _execute(self):
+    def _search_path(self):
+        if self._doc_type is None:
+            return self._index + '/_search'
+        return self._index + '/' + self._doc_type + '/_search'
+
+    def _execute(self, slices=None):
         if self._client is None:
             raise _unbound_index_err
 
-        if self._doc_type is None:
-            path = self._index + '/_search'
-        else:
-            path = self._index + '/' + self._doc_type + '/_search'
+        path = self._search_path()
 
         if self._aggregation is None and self._groupby is None:
+            if self._pagination == 'pit':
+                if self._compat < 7:
+                    raise DataFrameException('Point in time requires ES version 7 or above')
+                if slices is not None and slices > 1:
+                    raise DataFrameException('slices is not supported by pit pagination')
+                select = ScrollSelect(lambda: self._pit_search(self._build_query(), select))
+                return select
+            if slices is not None and slices > 1:
+                if self._compat < 5:
+                    raise DataFrameException('Sliced scroll requires ES version 5 or above')
+                return ScrollSelect(lambda: self._sliced_scroll(path, self._build_query(), slices))
+            return ScrollSelect(lambda: self._scroll(path, self._build_query()))
 
-            def _scroll():
-                row_counter = 0
-
-                _query = self._build_query()
-                resp = self._client.post(path, params={"scroll": "10s"}, data=_query)
-                scroll_id = resp.get("_scroll_id")
-                try:
-                    while scroll_id and resp["hits"]["hits"]:
-                        if row_counter >= self._limit:
-                            break
+        else:
+            res_dict = self._client.post(path, data=self._build_query())
+            return Agg.from_dict(res_dict)
 
-                        for hit in resp["hits"]["hits"]:
+    def _open_pit(self):
+        resp = self._client.post(self._index + '/_pit', data=None, params={'keep_alive': self._scroll_keepalive})
+        return resp['id']
 
-                            if row_counter >= self._limit:
-                                break
+    def _close_pit(self, pit_id):
+        try:
+            self._client.delete('_pit', data={'id': pit_id})
+        except Exception:
+            # best effort: the point in time may have expired already
+            pass
 
-                            row_counter += 1
-                            yield hit
+    def _pit_search(self, query, select):
+        """
+        Yields no more than ``limit`` hits by paging with search_after in a point in time.
 
-                        resp = self._client.post('_search/scroll',
-                                                data={"scroll_id": scroll_id, "scroll": "10s"})
-                        scroll_id = resp.get("_scroll_id")
+        The position of the last hit is kept in the cursor of ``select``, from which a new search
+        can be resumed by :meth:`resume_from`.
+        """
+        query = dict(query)
+        query['sort'] = list(query.get('sort') or []) + [_pit_tiebreaker]
 
-                finally:
-                    # TODO(onesuper): Delete the scroll resource anyway
-                    pass
-            return ScrollSelect(_scroll)
+        if self._cursor is not None:
+            pit_id, search_after, row_counter = decode_cursor(self._cursor)
+            resuming = True
+        else:
+            pit_id, search_after, row_counter = self._open_pit(), None, 0
+            resuming = False
+
+        completed = False
+        try:
+            while row_counter < self._limit:
+                query['size'] = min(self.batch_size, self._limit - row_counter)
+                query['pit'] = {'id': pit_id, 'keep_alive': self._scroll_keepalive}
+                if search_after is not None:
+                    query['search_after'] = search_after
+                try:
+                    resp, hits = self._post_search('_search', query)
+                except ServerDefinedException:
+                    if not resuming:
+                        raise
+                    # the point in time of the cursor has expired, go on in a new one
+                    pit_id = self._open_pit()
+                    query['pit'] = {'id': pit_id, 'keep_alive': self._scroll_keepalive}
+                    resp, hits = self._post_search('_search', query)
+                resuming = False
+
+                page_counter = 0
+                for hit in hits:
+                    page_counter += 1
+                    row_counter += 1
+                    search_after = hit['sort']
+                    select._cursor = (resp.get('pit_id', pit_id), search_after, row_counter)
+                    yield hit
+                pit_id = resp.get('pit_id', pit_id)
+
+                if page_counter < query['size']:
+                    break
+            completed = True
+        except GeneratorExit:
+            completed = True
+            raise
+        finally:
+            # keep the point in time alive on errors, so that the search can be resumed
+            if completed:
+                self._close_pit(pit_id)
+
+    def resume_from(self, cursor):
+        """
+        Returns a new :class:`DataFrame <DataFrame>` continuing a 'pit' paginated search after the cursor.
+
+        :param str cursor: The :attr:`cursor <pandasticsearch.queries.ScrollSelect.cursor>` of the
+            query result of the interrupted search
+        :return: :class:`DataFrame <DataFrame>`
+
+        >>> query = df._execute()
+        >>> try:
+        ...     for row in query.row_generator():
+        ...         write(row)
+        ... finally:
+        ...     save(query.cursor)
+        >>> df.resume_from(load()).to_pandas()
+        """
+        if self._pagination != 'pit':
+            raise DataFrameException('resume_from() requires pit pagination')
+        decode_cursor(cursor)
+        return self._copy(cursor=cursor)
+
+    def _post_search(self, path, query, params=None):
+        """
+        Posts a search and returns a tuple of (response, hits).
+
+        In streaming mode the hits are decoded one by one while iterating, and the response
+        is only complete once the hits are consumed.
+        """
+        if self._streaming:
+            stream = self._client.post_stream(path, data=query, params=params)
+            return stream.meta, stream.hits()
+        resp = self._client.post(path, data=query, params=params)
+        return resp, resp["hits"]["hits"]
+
+    def _scroll_hits(self, path, query):
+        """
+        Yields the hits of a scroll search, no more than ``limit`` hits in total.
+        """
+        row_counter = 0
+        scroll_id = None
+
+        resp, hits = self._post_search(path, query, params={"scroll": self._scroll_keepalive})
+        try:
+            while True:
+                page_counter = 0
+                for hit in hits:
+                    if row_counter >= self._limit:
+                        break
+                    page_counter += 1
+                    row_counter += 1
+                    yield hit
+                _close(hits)
 
+                scroll_id = resp.get("_scroll_id")
+                if not scroll_id or page_counter == 0 or row_counter >= self._limit:
+                    break
+
+                resp, hits = self._post_search('_search/scroll',
+                                               {"scroll_id": scroll_id, "scroll": self._scroll_keepalive})
+
+        finally:
+            _close(hits)
+            scroll_id = resp.get("_scroll_id", scroll_id)
+            if scroll_id:
+                self._clear_scroll(scroll_id)
+
+    def _clear_scroll(self, scroll_id):
+        """
+        Frees the search context of a scroll, rather than pinning it until the keep-alive expires.
+        """
+        try:
+            self._client.delete('_search/scroll', data={"scroll_id": [scroll_id]})
+        except Exception:
+            # best effort: the context may have expired already
+            pass
+
+    def _search_hits(self, path, query):
+        resp, hits = self._post_search(path, query)
+        try:
+            for hit in itertools.islice(hits, self._limit):
+                yield hit
+        finally:
+            _close(hits)
+
+    def _scroll(self, path, query):
+        if self._limit <= query['size']:
+            # all the hits fit in one page, no need to keep a scroll context
+            hits = self._search_hits(path, query)
         else:
-            res_dict = self._client.post(path, data=self._build_query())
-            return Agg.from_dict(res_dict)
+            hits = self._scroll_hits(path, query)
+        try:
+            for hit in hits:
+                yield hit
+        finally:
+            hits.close()
 
-    def collect(self):
+    def _sliced_scroll(self, path, query, slices):
+        """
+        Drains ``slices`` sliced scrolls concurrently and yields their hits as the pages arrive.
+        """
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            raise NoSuchDependencyException('sliced scroll requires futures library')
+
+        # bounded, so that the workers never run far ahead of the consumer
+        pages = queue.Queue(maxsize=2 * slices)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def drain(slice_id):
+            sliced_query = dict(query, slice={'id': slice_id, 'max': slices})
+            hits = self._scroll_hits(path, sliced_query)
+            try:
+                while True:
+                    page = list(itertools.islice(hits, query['size']))
+                    if not page or not put(page):
+                        break
+            except Exception:
+                put(sys.exc_info()[1])
+            finally:
+                hits.close()
+                put(_slice_done)
+
+        executor = ThreadPoolExecutor(max_workers=slices)
+        try:
+            for slice_id in range(slices):
+                executor.submit(drain, slice_id)
+
+            row_counter = 0
+            done = 0
+            while done < slices and row_counter < self._limit:
+                item = pages.get()
+                if item is _slice_done:
+                    done += 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                for hit in item:
+                    if row_counter >= self._limit:
+                        break
+                    row_counter += 1
+                    yield hit
+        finally:
+            stop.set()
+            executor.shutdown(wait=False)
+
+    def collect(self, slices=None):
         """
         Returns all the records as a list of Row.
 
+        :param int optional slices: Number of sliced scrolls read in parallel
         :return: list of :class:`Row <pandasticsearch.types.Row>`
 
         >>> df.collect()
         [Row(age=2, name='Alice'), Row(age=5, name='Bob')]
         """
-        query = self._execute()
+        query = self._execute(slices=slices)
         return [Row(**v) for v in query.result]
 
-    def to_pandas(self):
+    def to_pandas(self, slices=None, columnar=False):
         """
         Export to a Pandas DataFrame object.
 
+        :param int optional slices: Number of sliced scrolls read in parallel, so that a large
+            export uses all the shards of the index. The order of the rows is not preserved.
+        :param bool optional columnar: Decode the hits straight into typed columns (int64, float64,
+            bool, datetime64 or object) according to the index mapping, which is faster and uses
+            less memory for large exports
         :return: The DataFrame representing the query result
 
         >>> df[df['gender'] == 'male'].agg(Avg('age')).to_pandas()
             avg(age)
         0        12
+        >>> df.limit(10000000).to_pandas(slices=8, columnar=True)
         """
-        query = self._execute()
+        query = self._execute(slices=slices)
+        if columnar and isinstance(query, ScrollSelect):
+            return query.to_pandas(columnar=True, column_types=self._get_column_types(), capacity=self.batch_size)
         return query.to_pandas()
 
+    def _arrow_schema(self, nested):
+        if not self._mapping:
+            raise _unbound_index_err
+        projection = None
+        if self._projection:
+            projection = [col.field_name() for col in self._projection]
+        return arrow_schema(self._get_properties(self._mapping), projection=projection, nested=nested)
+
+    def iter_arrow_batches(self, batch_rows=None, nested='flatten'):
+        """
+        Yields the rows as ``pyarrow.RecordBatch`` objects built straight from the scroll pages.
+
+        The schema comes from the index mapping, so all the batches share it. Only one batch is
+        kept in memory at a time.
+
+        :param int optional batch_rows: Number of rows of each batch (default: the batch size of the scroll)
+        :param str optional nested: 'flatten' for one column per leaf field (e.g. 'c.d'),
+            or 'struct' for struct columns of objects
+        :return: iterator of ``pyarrow.RecordBatch``
+
+        >>> for batch in df.iter_arrow_batches(batch_rows=10000):
+        ...     writer.write_batch(batch)
+        """
+        if self._aggregation is not None or self._groupby is not None:
+            raise DataFrameException('iter_arrow_batches() is not allowed for aggregation')
+
+        builder = ArrowBatchBuilder(self._arrow_schema(nested), batch_rows or self.batch_size, nested=nested)
+        hits = self._execute().hits_generator()
+        try:
+            for batch in builder.batches(hits):
+                yield batch
+        finally:
+            _close(hits)
+
+    def to_arrow(self, nested='flatten'):
+        """
+        Export to a ``pyarrow.Table`` object, without building Python rows or a Pandas DataFrame.
+
+        :param str optional nested: 'flatten' for one column per leaf field (e.g. 'c.d'),
+            or 'struct' for struct columns of objects
+        :return: ``pyarrow.Table``
+
+        >>> df.select('name', 'age').to_arrow()
+        """
+        if self._aggregation is not None or self._groupby is not None:
+            raise DataFrameException('to_arrow() is not allowed for aggregation')
+
+        schema = self._arrow_schema(nested)
+        batches = list(self.iter_arrow_batches(nested=nested))
+        import pyarrow
+        return pyarrow.Table.from_batches(batches, schema=schema)
+
     def count(self):
         """
         Returns a list of numbers indicating the count for each group
@@ -390,19 +702,52 @@ class DataFrame(object):
         >>> df.groupby(df.gender).count()
         [2, 1]
         """
-        df = DataFrame(client=self._client,
-                       index=self._index,
-                       doc_type=self._doc_type,
-                       mapping=self._mapping,
-                       filter=self._filter,
-                       groupby=self._groupby,
-                       aggregation=_count_aggregator,
-                       projection=self._projection,
-                       sort=self._sort,
-                       limit=self._limit,
-                       compat=self._compat)
+        df = self._copy(aggregation=_count_aggregator)
         return df
 
+    def acollect(self):
+        """
+        Coroutine returning all the records as a list of Row, the async variant of :meth:`collect`.
+
+        The requests are sent by an :class:`AsyncRestClient <pandasticsearch.aio.AsyncRestClient>`,
+        so that one event loop runs many searches and scroll pages concurrently.
+
+        >>> rows = await df.acollect()
+        >>> males, females = await asyncio.gather(df[df.gender == 'male'].acollect(),
+        ...                                       df[df.gender == 'female'].acollect())
+        """
+        from pandasticsearch import aio
+        return aio.acollect(self)
+
+    def ato_pandas(self, columnar=False):
+        """
+        Coroutine exporting to a Pandas DataFrame object, the async variant of :meth:`to_pandas`.
+
+        >>> pdf = await df.ato_pandas()
+        """
+        from pandasticsearch import aio
+        return aio.ato_pandas(self, columnar=columnar)
+
+    def acount(self):
+        """
+        Coroutine returning the count rows of :meth:`count`.
+
+        >>> await df.groupby(df.gender).acount()
+        [Row(count=2), Row(count=1)]
+        """
+        from pandasticsearch import aio
+        return aio.acollect(self.count())
+
+    def aiter_rows(self):
+        """
+        Returns an async iterator streaming the rows of the scroll without keeping them.
+
+        >>> async for row in df.aiter_rows():
+        ...     print(row)
+        """
+        from pandasticsearch import aio
+        return aio.aiter_rows(self)
+
     def show(self, n=200, truncate=15):
         """
         Prints the first ``n`` rows to the console.
@@ -497,7 +842,7 @@ class DataFrame(object):
     def _build_query(self):
         query = dict()
 
-        query['size'] = 20  # batch size for scroll search
+        query['size'] = self.batch_size  # batch size for scroll search
 
         if self._groupby and not self._aggregation:
             query['aggregations'] = self._groupby
@@ -559,13 +904,38 @@ class DataFrame(object):
                     prop.append("{}.{}".format(field, nested_prop))
         return prop
 
-    def _get_mappings(self, json_map):
+    @classmethod
+    def resolve_mapping_types(cls, json_map):
+        """
+        Returns the ES types of the (flattened) fields as a dictionary.
+        """
+        types = {}
+        for field in json_map:
+            nested_types = {}
+            if "properties" in json_map[field]:
+                nested_types = cls.resolve_mapping_types(json_map[field]["properties"])
+            if len(nested_types) == 0:
+                types[field] = json_map[field].get("type", "object")
+            else:
+                for nested_field, nested_type in nested_types.items():
+                    types["{}.{}".format(field, nested_field)] = nested_type
+        return types
+
+    def _get_properties(self, json_map):
         index_name = list(self._mapping.keys())[0]
 
         if self._compat >= 7:
-            return DataFrame.resolve_mappings(json_map[index_name]["mappings"]["properties"])
+            return json_map[index_name]["mappings"]["properties"]
         else:
             if self._doc_type is not None:
-                return DataFrame.resolve_mappings(json_map[index_name]["mappings"][self._doc_type]["properties"])
+                return json_map[index_name]["mappings"][self._doc_type]["properties"]
             else:
                 raise DataFrameException('Please specify doc_type for ES version under 7')
+
+    def _get_mappings(self, json_map):
+        return DataFrame.resolve_mappings(self._get_properties(json_map))
+
+    def _get_column_types(self):
+        if not self._mapping:
+            return {}
+        return DataFrame.resolve_mapping_types(self._get_properties(self._mapping))
@@ -20,3 +20,7 @@ class ParseResultException(PandasticSearchException):
 
 class DataFrameException(PandasticSearchException):
     pass
+
+
+class CircuitOpenException(PandasticSearchException):
+    pass
@@ -0,0 +1,108 @@
+# -*- coding: UTF-8 -*-
+
+import itertools
+import threading
+import time
+
+import six
+
+_selectors = ('round_robin', 'least_in_flight')
+
+
+class NodePool(object):
+    """
+    NodePool spreads the requests of a :class:`RestClient <pandasticsearch.client.RestClient>` across
+    the nodes of a cluster.
+
+    A node is chosen by round-robin, or as the one with the fewest requests in flight. A node which
+    could not be connected is marked dead and left out until ``dead_timeout`` seconds have passed.
+    When all the nodes are dead, the one which died first is tried again.
+
+    It is thread-safe.
+
+    >>> nodes = NodePool(['http://es1:9200', 'http://es2:9200'], selector='least_in_flight')
+    >>> host = nodes.acquire()
+    >>> try:
+    ...     send(host)
+    ... finally:
+    ...     nodes.release(host)
+    """
+
+    def __init__(self, hosts, selector='round_robin', dead_timeout=60):
+        """
+        :param hosts: A host URL or a list of host URLs
+        :param str selector: 'round_robin' or 'least_in_flight'
+        :param float dead_timeout: Seconds during which a dead node is not chosen
+        """
+        if selector not in _selectors:
+            raise ValueError('selector is supposed to be round_robin or least_in_flight: {0}'.format(selector))
+        self.selector = selector
+        self.dead_timeout = dead_timeout
+        self._lock = threading.Lock()
+        self._dead = {}  # host -> time until which it is left out
+        self._in_flight = {}
+        self.set_hosts(hosts)
+
+    @property
+    def hosts(self):
+        return list(self._hosts)
+
+    def set_hosts(self, hosts):
+        """
+        Replaces the hosts, e.g. by the ones discovered from the cluster.
+        """
+        if isinstance(hosts, six.string_types):
+            hosts = [hosts]
+        hosts = list(hosts)
+        if not hosts:
+            raise ValueError('At least one host must be specified')
+        with self._lock:
+            self._hosts = hosts
+            self._counter = itertools.count()
+            self._dead = dict((h, t) for h, t in self._dead.items() if h in hosts)
+            self._in_flight = dict((h, self._in_flight.get(h, 0)) for h in hosts)
+
+    def _live_hosts(self, now):
+        live = [h for h in self._hosts if self._dead.get(h, 0) <= now]
+        if live:
+            return live
+        # every node is dead, try again the one which has been dead the longest
+        return [min(self._hosts, key=lambda h: self._dead[h])]
+
+    def acquire(self):
+        """
+        Chooses the host of a request, which has to be given back by :meth:`release`.
+        """
+        with self._lock:
+            live = self._live_hosts(time.time())
+            if self.selector == 'least_in_flight':
+                start = next(self._counter)
+                # ties are broken in round-robin order
+                host = min((live[(start + i) % len(live)] for i in range(len(live))),
+                           key=lambda h: self._in_flight.get(h, 0))
+            else:
+                host = live[next(self._counter) % len(live)]
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+            return host
+
+    def release(self, host):
+        with self._lock:
+            if self._in_flight.get(host, 0) > 0:
+                self._in_flight[host] -= 1
+
+    def in_flight(self, host):
+        return self._in_flight.get(host, 0)
+
+    def mark_dead(self, host):
+        with self._lock:
+            self._dead[host] = time.time() + self.dead_timeout
+
+    def mark_live(self, host):
+        with self._lock:
+            self._dead.pop(host, None)
+
+    def is_dead(self, host):
+        return self._dead.get(host, 0) > time.time()
+
+    def __len__(self):
+        return len(self._hosts)
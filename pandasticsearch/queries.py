@@ -4,10 +4,32 @@ try:
     from collections.abc import MutableSequence
 except ImportError:
     from collections import MutableSequence
+import base64
 import json
+import weakref
 import six
 
-from pandasticsearch.errors import NoSuchDependencyException
+from pandasticsearch.columnar import ColumnarBuilder
+from pandasticsearch.errors import NoSuchDependencyException, ParseResultException
+
+
+def encode_cursor(pit_id, search_after, count):
+    """
+    Encodes the position of a 'pit' paginated search into a token.
+    """
+    data = json.dumps({'pit_id': pit_id, 'search_after': search_after, 'count': count})
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token):
+    """
+    Decodes a token made by :func:`encode_cursor` into a tuple of (pit_id, search_after, count).
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+        return data['pit_id'], data['search_after'], data['count']
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ParseResultException('Invalid cursor: {0}'.format(token))
 
 
 class Query(MutableSequence):
@@ -133,7 +155,7 @@ class Select(Query):
         tavnit = '|'
         separator = '+'
 
-        cached_result = [kv for kv in self.result[:n]]
+        cached_result = [kv for kv in self[:n]]
         for col in cols:
             maxlen = len(col)
             for kv in cached_result:
@@ -170,14 +192,74 @@ class Select(Query):
 class ScrollSelect(Select):
     """
     millis_taken/json not supported for ScrollSelect
+
+    The rows are fetched lazily and kept once fetched, so repeated access (``result``, ``len()``,
+    indexing) never runs the scroll again. ``q[10]`` only fetches the first 11 rows.
+
+    The scroll contexts opened by a partially consumed iterator are released by :meth:`close`,
+    or by using the ScrollSelect as a context manager:
+
+    >>> with df._execute() as query:
+    ...     for row in query.row_generator():
+    ...         break
     """
     def __init__(self, hits_generator):
         super(ScrollSelect, self).__init__()
         self.hits_generator = hits_generator
+        self._open_hits = weakref.WeakSet()
+        self._values = []
+        self._rows = None  # the running row generator filling self._values
+        self._exhausted = False
+        self._cursor = None  # (pit_id, search_after, count) of the last fetched hit
+
+    @property
+    def cursor(self):
+        """
+        Token of the position after the last fetched row of a 'pit' paginated search,
+        see :meth:`DataFrame.resume_from <pandasticsearch.dataframe.DataFrame.resume_from>`.
+        """
+        if self._cursor is None:
+            return None
+        return encode_cursor(*self._cursor)
+
+    def close(self):
+        """
+        Stops all the running iterators and releases their server-side resources.
+
+        The rows fetched so far are dropped unless the whole result has been fetched.
+        """
+        for hits in list(self._open_hits):
+            hits.close()
+        if not self._exhausted:
+            self._rows = None
+            self._values = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _fetch(self, n=None):
+        """
+        Fetches rows until ``n`` rows are kept (all the rows if ``n`` is None).
+        """
+        if self._exhausted:
+            return
+        if self._rows is None:
+            self._rows = self.row_generator()
+        while n is None or len(self._values) < n:
+            try:
+                self._values.append(next(self._rows))
+            except StopIteration:
+                self._exhausted = True
+                self._rows = None
+                break
 
     @property
     def result(self):
-        return [r for r in self.row_generator()]
+        self._fetch()
+        return self._values
 
     def __str__(self):
         return str(self.result)
@@ -185,17 +267,75 @@ class ScrollSelect(Select):
     def __len__(self):
         return len(self.result)
 
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.stop is not None and index.stop >= 0 and (index.start or 0) >= 0:
+                self._fetch(index.stop)
+            else:
+                self._fetch()
+        elif index >= 0:
+            self._fetch(index + 1)
+        else:
+            self._fetch()
+        return self._values[index]
+
+    def insert(self, index, value):
+        self._fetch()
+        super(ScrollSelect, self).insert(index, value)
+
+    def append(self, value):
+        self._fetch()
+        super(ScrollSelect, self).append(value)
+
+    def __delitem__(self, index):
+        self._fetch()
+        super(ScrollSelect, self).__delitem__(index)
+
+    def __setitem__(self, index, value):
+        self._fetch()
+        super(ScrollSelect, self).__setitem__(index, value)
+
     def row_generator(self):
-        for hit in self.hits_generator():
-            yield self.hit_to_row(hit)
+        """
+        Streams the rows from Elasticsearch without keeping them.
+        """
+        hits = self.hits_generator()
+        closeable = hasattr(hits, 'close')
+        if closeable:
+            self._open_hits.add(hits)
+        try:
+            for hit in hits:
+                yield self.hit_to_row(hit)
+        finally:
+            if closeable:
+                hits.close()
 
-    def to_pandas(self):
+    def to_pandas(self, columnar=False, column_types=None, capacity=5000):
+        """
+        Export the query result to a Pandas DataFrame object.
+
+        :param bool columnar: Decode the hits straight into typed columns, see
+            :class:`ColumnarBuilder <pandasticsearch.columnar.ColumnarBuilder>`
+        :param dict column_types: ES field types by column name, used by the columnar decoding
+        :param int capacity: Number of rows allocated at a time by the columnar decoding
+        """
         try:
             import pandas
         except ImportError:
             raise NoSuchDependencyException('this method requires pandas library')
 
-        df = pandas.DataFrame(self.row_generator())
+        if columnar and not self._exhausted:
+            builder = ColumnarBuilder(column_types, capacity=capacity)
+            hits = self.hits_generator()
+            try:
+                for hit in hits:
+                    builder.append(hit)
+            finally:
+                if hasattr(hits, 'close'):
+                    hits.close()
+            return builder.to_pandas()
+
+        df = pandas.DataFrame(self.result)
         return df
 
 
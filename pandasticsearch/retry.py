@@ -0,0 +1,183 @@
+# -*- coding: UTF-8 -*-
+
+import email.utils
+import random
+import threading
+import time
+
+from pandasticsearch.errors import CircuitOpenException
+
+# statuses of an overloaded or unavailable cluster
+_retry_statuses = (429, 502, 503, 504)
+
+# statuses for which ES has rejected a request without executing it
+_rejected_statuses = (429, 503)
+
+# read-only endpoints, which may be posted again
+_read_only_endpoints = ('_search', '_count', '_msearch', '_mapping', '_mappings', '_field_caps', '_pit')
+
+
+def _endpoint(path):
+    return path.split('?', 1)[0].rstrip('/').split('/')[-1]
+
+
+def _parse_retry_after(value):
+    """
+    Returns the seconds of a Retry-After header, in seconds or as an HTTP date.
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(email.utils.mktime_tz(parsed) - time.time(), 0)
+
+
+class RetryPolicy(object):
+    """
+    RetryPolicy tells a :class:`RestClient <pandasticsearch.client.RestClient>` which error responses
+    are sent again and how long to wait before that.
+
+    The delay of the n-th retry is drawn between 0 and ``min(max_backoff, backoff_factor * 2 ** n)``
+    (full jitter), unless the response has a ``Retry-After`` header.
+
+    Only idempotent requests are retried: GET, HEAD and DELETE, and POST to read-only endpoints such
+    as ``_search``. A scroll continuation (``_search/scroll``) advances the scroll when it is executed,
+    so it is only retried if ES has rejected it without executing it (429 and 503); after a 502 or
+    504 from a proxy, the page may have been consumed already.
+
+    >>> from pandasticsearch.retry import RetryPolicy
+    >>> client = RestClient('http://host:port', retry=RetryPolicy(max_attempts=5, backoff_factor=1))
+    """
+
+    def __init__(self, max_attempts=3, backoff_factor=0.5, max_backoff=30, statuses=_retry_statuses, jitter=True):
+        """
+        :param int max_attempts: Max number of attempts of a request, including the first one
+        :param float backoff_factor: Base delay in seconds of the exponential backoff
+        :param float max_backoff: Max delay in seconds of the backoff
+        :param statuses: HTTP statuses which are retried
+        :param bool jitter: Whether the delay is randomized, so that the clients don't retry all at once
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = tuple(statuses)
+        self.jitter = jitter
+
+    def is_retryable(self, method, path, status):
+        """
+        Tells whether a request which got ``status`` can be sent again.
+        """
+        if status not in self.statuses:
+            return False
+        if path.split('?', 1)[0].rstrip('/').endswith('_search/scroll') and method != 'DELETE':
+            return status in _rejected_statuses
+        if method in ('GET', 'HEAD', 'DELETE'):
+            return True
+        return method == 'POST' and _endpoint(path) in _read_only_endpoints
+
+    def backoff(self, attempt):
+        """
+        Returns the delay in seconds before the retry following the ``attempt``-th attempt (from 0).
+        """
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Returns the delay in seconds before a retry, ``Retry-After`` if the server has sent one.
+        """
+        seconds = _parse_retry_after(retry_after)
+        if seconds is not None:
+            return seconds
+        return self.backoff(attempt)
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class CircuitBreaker(object):
+    """
+    CircuitBreaker stops sending requests to a cluster which keeps answering that it is overloaded.
+
+    After ``failure_threshold`` consecutive overload responses the circuit opens and the requests
+    fail at once with :class:`CircuitOpenException <pandasticsearch.errors.CircuitOpenException>`.
+    After ``reset_timeout`` seconds one request is let through: the circuit closes again if it
+    succeeds, and opens for another ``reset_timeout`` otherwise.
+
+    It is thread-safe and can be shared by several clients of the same cluster.
+
+    >>> from pandasticsearch.retry import CircuitBreaker
+    >>> client = RestClient('http://host:port', circuit_breaker=CircuitBreaker(failure_threshold=5))
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, statuses=_retry_statuses):
+        """
+        :param int failure_threshold: Number of consecutive overload responses which open the circuit
+        :param float reset_timeout: Seconds before a request is tried again on an open circuit
+        :param statuses: HTTP statuses counted as overload responses
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.statuses = tuple(statuses)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    @property
+    def state(self):
+        """
+        'closed', 'open' or 'half_open'.
+        """
+        with self._lock:
+            return self._state(time.time())
+
+    def _state(self, now):
+        if self._opened_at is None:
+            return 'closed'
+        if now - self._opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def before_request(self):
+        """
+        Raises :class:`CircuitOpenException <pandasticsearch.errors.CircuitOpenException>` if the request
+        must not be sent.
+        """
+        with self._lock:
+            state = self._state(time.time())
+            if state == 'closed':
+                return
+            if state == 'half_open' and not self._trial:
+                self._trial = True
+                return
+            raise CircuitOpenException('The circuit is open after {0} overload responses'.format(self._failures))
+
+    def record(self, status):
+        """
+        Records the status of a response.
+        """
+        if status in self.statuses:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.time()
@@ -0,0 +1,142 @@
+# -*- coding: UTF-8 -*-
+
+import codecs
+import json
+
+from pandasticsearch.errors import ParseResultException
+
+_whitespace = ' \t\n\r'
+
+
+class SearchResponseStream(object):
+    """
+    Decodes a search response incrementally while it is read from the socket.
+
+    The entries of ``hits.hits`` are decoded and handed out one at a time by :meth:`hits`, so the
+    memory needed scales with a single hit rather than with the whole page. All the other fields
+    are kept in :attr:`meta` as they are read (e.g. ``_scroll_id``, ``took`` and ``hits.total``).
+
+    >>> stream = client.post_stream('index/_search', data={'size': 1000})
+    >>> for hit in stream.hits():
+    ...     print(hit['_source'])
+    >>> stream.meta['took']
+    """
+
+    def __init__(self, response, chunk_size=64 * 1024):
+        """
+        :param response: A file-like object with ``read(n)`` and ``close()``
+        :param int chunk_size: Number of bytes read from the response at a time
+        """
+        self.meta = {}
+        self._response = response
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def close(self):
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def _fill(self, size=None):
+        """
+        Reads more data into the buffer, returns False at the end of the response.
+        """
+        if self._eof:
+            return False
+        if self._pos > 0:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        data = self._response.read(size or self._chunk_size)
+        if not data:
+            self._eof = True
+            self._buf += self._decoder.decode(b'', final=True)
+            return False
+        self._buf += self._decoder.decode(data)
+        return True
+
+    def _peek(self):
+        while self._pos >= len(self._buf):
+            if not self._fill():
+                return ''
+        return self._buf[self._pos]
+
+    def _skip_ws(self):
+        ch = self._peek()
+        while ch and ch in _whitespace:
+            self._pos += 1
+            ch = self._peek()
+        return ch
+
+    def _expect(self, ch):
+        if self._skip_ws() != ch:
+            raise ParseResultException('Expected {0!r} at offset {1} of the response'.format(ch, self._pos))
+        self._pos += 1
+
+    def _value(self):
+        """
+        Decodes the next complete JSON value in the buffer.
+        """
+        self._skip_ws()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+            except ValueError:
+                # the value is incomplete, read at least as much as we have to avoid quadratic re-parsing
+                if not self._fill(max(self._chunk_size, len(self._buf))):
+                    raise ParseResultException('Unexpected end of the response')
+                continue
+            if end == len(self._buf) and not self._eof:
+                # a number may continue in the next chunk
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _members(self, close):
+        """
+        Iterates the members of the object or array just opened, the caller has to consume each value.
+        """
+        if self._skip_ws() == close:
+            self._pos += 1
+            return
+        while True:
+            yield
+            ch = self._skip_ws()
+            self._pos += 1
+            if ch == close:
+                return
+            if ch != ',':
+                raise ParseResultException('Unexpected {0!r} in the response'.format(ch))
+
+    def _keys(self):
+        for _ in self._members('}'):
+            key = self._value()
+            self._expect(':')
+            self._skip_ws()
+            yield key
+
+    def hits(self):
+        """
+        Yields the entries of ``hits.hits`` one by one, and closes the response at the end.
+        """
+        try:
+            self._expect('{')
+            for key in self._keys():
+                if key == 'hits' and self._peek() == '{':
+                    self._pos += 1
+                    hits_meta = self.meta.setdefault('hits', {})
+                    for hits_key in self._keys():
+                        if hits_key == 'hits' and self._peek() == '[':
+                            self._pos += 1
+                            for _ in self._members(']'):
+                                yield self._value()
+                        else:
+                            hits_meta[hits_key] = self._value()
+                else:
+                    self.meta[key] = self._value()
+        finally:
+            self.close()
@@ -5,6 +5,8 @@ with open('requirements.txt') as f:
 
 extras_require = {
     "pandas": ["pandas"],
+    "orjson": ["orjson"],
+    "arrow": ["pyarrow"],
 }
 
 setup(
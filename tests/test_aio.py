@@ -0,0 +1,262 @@
+# -*- coding: UTF-8 -*-
+import asyncio
+import json
+import threading
+import unittest
+from six.moves import BaseHTTPServer, socketserver
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from pandasticsearch.aio import AsyncRestClient
+from pandasticsearch.client import RestClient
+from pandasticsearch.errors import DataFrameException, ServerDefinedException
+from pandasticsearch.retry import RetryPolicy
+from pandasticsearch.types import Row
+from tests.test_dataframe import ScrollClient, create_df_with_client
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.peers.add(self.client_address)
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.path.startswith('/missing'):
+            status, resp = 404, {'error': 'index_not_found_exception'}
+        elif self.path.startswith('/busy') and self.server.busy > 0:
+            self.server.busy -= 1
+            status, resp = 429, {'error': 'es_rejected_execution_exception'}
+        else:
+            status, resp = 200, {'path': self.path, 'method': self.command, 'body': body.decode('utf-8')}
+        data = json.dumps(resp).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        if self.path.startswith('/chunked'):
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(0, len(data), 5):
+                chunk = data[i:i + 5]
+                self.wfile.write('{0:x}\r\n'.format(len(chunk)).encode('ascii') + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    do_POST = do_GET
+    do_DELETE = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class AsyncClient(object):
+    """
+    Runs the requests of a sync test client in coroutines.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    async def post(self, path, data, params=None):
+        await asyncio.sleep(0)
+        return self.client.post(path, data, params=params)
+
+    async def delete(self, path, data=None, params=None):
+        return self.client.delete(path, data=data, params=params)
+
+
+class AggClient(object):
+    def __init__(self):
+        self.bodies = []
+
+    async def post(self, path, data, params=None):
+        self.bodies.append(data)
+        return {'took': 1, 'aggregations': {'count': {'value': 3}}}
+
+
+class TestAsyncRestClient(unittest.TestCase):
+    def setUp(self):
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.peers = set()
+        self.server.busy = 0
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.client = AsyncRestClient('http://127.0.0.1:{0}'.format(self.server.server_address[1]))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_requests_reuse_connection(self):
+        async def requests():
+            try:
+                results = []
+                for i in range(3):
+                    results.append(await self.client.get('index/_search', params={'page': i}))
+                results.append(await self.client.post('index/_search', data={'size': 1}))
+                results.append(await self.client.delete('_search/scroll', data={'scroll_id': ['x']}))
+                return results
+            finally:
+                await self.client.close()
+
+        results = run(requests())
+        self.assertEqual([r['path'] for r in results[:3]], ['/index/_search?page={0}'.format(i) for i in range(3)])
+        self.assertEqual((results[3]['method'], json.loads(results[3]['body'])), ('POST', {'size': 1}))
+        self.assertEqual(results[4]['method'], 'DELETE')
+        self.assertEqual(len(self.server.peers), 1)
+
+    def test_concurrent_requests(self):
+        async def requests():
+            try:
+                return await asyncio.gather(*[self.client.post('index{0}/_search'.format(i), data={})
+                                              for i in range(5)])
+            finally:
+                await self.client.close()
+
+        results = run(requests())
+        self.assertEqual([r['path'] for r in results], ['/index{0}/_search'.format(i) for i in range(5)])
+
+    def test_chunked_response(self):
+        async def request():
+            try:
+                first = await self.client.get('chunked')
+                second = await self.client.get('chunked')
+                return first, second
+            finally:
+                await self.client.close()
+
+        first, second = run(request())
+        self.assertEqual(first['path'], '/chunked')
+        self.assertEqual(second['path'], '/chunked')
+        self.assertEqual(len(self.server.peers), 1)
+
+    def test_error(self):
+        async def request():
+            try:
+                await self.client.get('missing')
+            finally:
+                await self.client.close()
+
+        with self.assertRaises(ServerDefinedException) as cm:
+            run(request())
+        self.assertEqual(cm.exception.args[0], 'index_not_found_exception')
+
+    def test_retry(self):
+        self.server.busy = 2
+        self.client.retry = RetryPolicy(max_attempts=3)
+
+        async def request():
+            try:
+                return await self.client.post('busy/_search', data={})
+            finally:
+                await self.client.close()
+
+        self.assertEqual(run(request())['path'], '/busy/_search')
+        self.assertEqual(self.server.busy, 0)
+
+    def test_from_client(self):
+        sync = RestClient('http://localhost:9200', 'user', 'pass', verify_ssl=False, codec='json')
+        client = AsyncRestClient.from_client(sync)
+        self.assertEqual((client.host, client.username, client.password, client.verify_ssl),
+                         ('http://localhost:9200', 'user', 'pass', False))
+        self.assertIs(client.codec, sync.codec)
+
+
+class TestAsyncDataFrame(unittest.TestCase):
+    def test_acollect_scroll(self):
+        client = ScrollClient(pages=3, page_size=2)
+        df = create_df_with_client(None, async_client=AsyncClient(client), batch_size=2).limit(5)
+
+        rows = run(df.acollect())
+        self.assertEqual(rows, [Row(a=0, b=i) for i in range(5)])
+        self.assertEqual(client.paths[0], ('index/doc_type/_search', {'scroll': '1m'}))
+        self.assertEqual(client.cleared, ['0:2'])
+
+    def test_acollect_single_page(self):
+        client = ScrollClient(pages=3, page_size=2)
+        df = create_df_with_client(None, async_client=AsyncClient(client)).limit(2)
+
+        self.assertEqual(run(df.acollect()), [Row(a=0, b=0), Row(a=0, b=1)])
+        self.assertEqual(client.paths, [('index/doc_type/_search', None)])
+        self.assertEqual(client.cleared, [])
+
+    def test_aiter_rows_closes_scroll(self):
+        client = ScrollClient(pages=3, page_size=2)
+        df = create_df_with_client(None, async_client=AsyncClient(client), batch_size=2)
+
+        async def first_rows():
+            rows = []
+            it = df.aiter_rows()
+            async for row in it:
+                rows.append(row)
+                if len(rows) == 3:
+                    break
+            await it.aclose()
+            return rows
+
+        self.assertEqual(run(first_rows()), [Row(a=0, b=i) for i in range(3)])
+        self.assertEqual(client.cleared, ['0:1'])
+
+    def test_concurrent_dataframes(self):
+        clients = [ScrollClient(pages=2, page_size=2) for _ in range(3)]
+        dfs = [create_df_with_client(None, async_client=AsyncClient(c), batch_size=2) for c in clients]
+
+        async def collect_all():
+            return await asyncio.gather(*[df.acollect() for df in dfs])
+
+        for rows in run(collect_all()):
+            self.assertEqual(len(rows), 4)
+
+    def test_acount(self):
+        client = AggClient()
+        df = create_df_with_client(None, async_client=client)
+
+        self.assertEqual(run(df.acount()), [Row(count=3)])
+        self.assertEqual(client.bodies[0]['aggregations'], {'count': {'value_count': {'field': '_index'}}})
+
+    @unittest.skipIf(pandas is None, 'requires pandas')
+    def test_ato_pandas(self):
+        client = ScrollClient(pages=3, page_size=2)
+        df = create_df_with_client(None, async_client=AsyncClient(client), batch_size=2).limit(4)
+
+        pdf = run(df.ato_pandas())
+        self.assertEqual(list(pdf['b']), [0, 1, 2, 3])
+
+        pdf = run(df.ato_pandas(columnar=True))
+        self.assertEqual(list(pdf['b']), [0, 1, 2, 3])
+
+    def test_async_client_derived_from_client(self):
+        from pandasticsearch import aio
+        sync = RestClient('http://localhost:9200')
+        df = create_df_with_client(sync)
+        client = aio._client_of(df)
+        self.assertIsInstance(client, AsyncRestClient)
+        self.assertIs(aio._client_of(df.limit(10)), client)
+
+    def test_pit_not_supported(self):
+        df = create_df_with_client(None, async_client=AsyncClient(ScrollClient()), pagination='pit', compat=7)
+        with self.assertRaises(DataFrameException):
+            run(df.acollect())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: UTF-8 -*-
+import unittest
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+from pandasticsearch.dataframe import DataFrame
+from pandasticsearch.errors import ParseResultException
+
+mapping = {
+    "index": {
+        "mappings": {
+            "properties": {
+                "a": {"type": "integer"},
+                "f": {"type": "double"},
+                "c": {"properties": {
+                    "d": {"type": "keyword"},
+                    "e": {"type": "long"},
+                }},
+                "tags": {"type": "nested", "properties": {"k": {"type": "keyword"}}},
+            }
+        }
+    }
+}
+
+
+class HitsClient(object):
+    def __init__(self, hits):
+        self.hits = hits
+
+    def post(self, path, data, params=None):
+        return {'hits': {'hits': self.hits[:data['size']]}}
+
+
+def create_df(hits):
+    return DataFrame(client=HitsClient(hits), index='index', mapping=mapping, compat=7)
+
+
+def create_hits():
+    return [
+        {'_id': '1', '_index': 'index', '_score': 1.0,
+         '_source': {'a': 1, 'f': 0.5, 'c': {'d': 'x', 'e': 10}, 'tags': [{'k': 'u'}]}},
+        {'_id': '2', '_index': 'index', '_score': 1.0,
+         '_source': {'a': 2, 'c': {'d': ['y', 'z']}}},
+        {'_id': '3', '_index': 'index', '_score': 1.0,
+         '_source': {'a': 3, 'f': 1, 'c': {'e': 30}}},
+    ]
+
+
+@unittest.skipIf(pyarrow is None, 'requires pyarrow')
+class TestArrow(unittest.TestCase):
+    def test_to_arrow(self):
+        table = create_df(create_hits()).to_arrow()
+        self.assertEqual(table.schema.names, ['_id', '_index', '_score', 'a', 'c.d', 'c.e', 'f', 'tags'])
+        self.assertEqual(table.schema.field('a').type, pyarrow.int32())
+        self.assertEqual(table.column('a').to_pylist(), [1, 2, 3])
+        self.assertEqual(table.column('f').to_pylist(), [0.5, None, 1.0])
+        self.assertEqual(table.column('c.d').to_pylist(), ['x', '["y", "z"]', None])
+        self.assertEqual(table.column('tags').to_pylist(), [[{'k': 'u'}], None, None])
+
+    def test_struct(self):
+        hits = create_hits()
+        hits[1]['_source']['c']['d'] = 'y'
+        table = create_df(hits).select('c.e').to_arrow(nested='struct')
+        self.assertEqual(table.schema.names, ['_id', '_index', '_score', 'c'])
+        self.assertEqual(table.column('c').to_pylist()[2], {'d': None, 'e': 30})
+
+    def test_batches(self):
+        batches = list(create_df(create_hits()).iter_arrow_batches(batch_rows=2))
+        self.assertEqual([b.num_rows for b in batches], [2, 1])
+        self.assertEqual(batches[0].schema, batches[1].schema)
+
+    def test_type_mismatch(self):
+        hits = [{'_source': {'a': 1.5}}]
+        with self.assertRaises(ParseResultException):
+            create_df(hits).to_arrow()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,57 @@
 # -*- coding: UTF-8 -*-
+import gzip
+import io
+import json
+import threading
 import unittest
-from mock import patch, Mock
+import zlib
+from mock import call, patch, Mock
+from six.moves import BaseHTTPServer
+from six.moves import urllib
 
 from pandasticsearch.client import RestClient
+from pandasticsearch.connection import ConnectionPool
+from pandasticsearch.errors import CircuitOpenException, ServerDefinedException
+from pandasticsearch.retry import CircuitBreaker, RetryPolicy
+
+
+class _KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.peers.add(self.client_address)
+        request = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            request = gzip.GzipFile(fileobj=io.BytesIO(request)).read()
+        if self.path.startswith('/missing'):
+            status, body = 404, {'error': 'index_not_found_exception'}
+        elif self.path.startswith('/echo'):
+            status, body = 200, {'path': self.path, 'body': json.loads(request.decode('utf-8'))}
+        else:
+            status, body = 200, {'path': self.path}
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            data = zlib.compress(data)
+            self.send_header('Content-Encoding', 'deflate')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+    server.peers = set()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
 
 
 class TestClients(unittest.TestCase):
@@ -20,6 +69,181 @@ class TestClients(unittest.TestCase):
         self.assertIsNotNone(json)
         self.assertEqual(json, {"hits": {"hits": [{"_source": {}}]}})
 
+    @patch('pandasticsearch.client.urllib.request.urlopen')
+    def test_rest_client_delete(self, mock_urlopen):
+        response = Mock()
+        response.read.return_value = b'{"succeeded": true}'
+        mock_urlopen.return_value = response
+
+        client = RestClient("http://localhost:9200")
+        self.assertEqual(client.delete('_search/scroll', data={'scroll_id': ['xxx']}), {'succeeded': True})
+
+        req = mock_urlopen.call_args[0][0]
+        self.assertEqual(req.get_method(), 'DELETE')
+        self.assertEqual(req.get_full_url(), 'http://localhost:9200/_search/scroll')
+
+    def test_pooled_client_reuses_connection(self):
+        server = start_server()
+        pool = ConnectionPool(maxsize=2)
+        try:
+            host = 'http://127.0.0.1:{0}'.format(server.server_address[1])
+            client = RestClient(host, pool=pool)
+
+            for i in range(5):
+                self.assertEqual(client.get('index/_search', params={'page': i}),
+                                 {'path': '/index/_search?page={0}'.format(i)})
+            self.assertEqual(client.post('index/_search', data={}), {'path': '/index/_search'})
+            self.assertEqual(len(server.peers), 1)
+
+            with self.assertRaises(ServerDefinedException):
+                client.get('missing')
+            # the error body is consumed, so the connection is still reusable
+            client.get('index')
+            self.assertEqual(len(server.peers), 1)
+        finally:
+            pool.clear()
+            server.shutdown()
+            server.server_close()
+
+    @patch('pandasticsearch.client.urllib.request.urlopen')
+    def test_rest_client_round_robin(self, mock_urlopen):
+        response = Mock()
+        response.read.return_value = b'{}'
+        mock_urlopen.return_value = response
+
+        client = RestClient(['http://es1:9200', 'http://es2:9200'])
+        for _ in range(4):
+            client.get('index')
+        urls = [c[0][0].get_full_url() for c in mock_urlopen.call_args_list]
+        self.assertEqual(urls, ['http://es1:9200/index', 'http://es2:9200/index'] * 2)
+
+    @patch('pandasticsearch.client.urllib.request.urlopen')
+    def test_rest_client_failover(self, mock_urlopen):
+        response = Mock()
+        response.read.return_value = b'{"ok": true}'
+
+        down = ['http://es1']
+
+        def urlopen(req):
+            if any(req.get_full_url().startswith(host) for host in down):
+                raise urllib.error.URLError('connection refused')
+            return response
+
+        mock_urlopen.side_effect = urlopen
+
+        client = RestClient(['http://es1:9200', 'http://es2:9200'])
+        self.assertEqual(client.get('index'), {'ok': True})
+        self.assertTrue(client.nodes.is_dead('http://es1:9200'))
+        self.assertEqual(client.get('index'), {'ok': True})
+        # the dead node is not tried again until its cool-down is over
+        self.assertEqual(mock_urlopen.call_count, 3)
+
+        down.append('http://es2')
+        with self.assertRaises(urllib.error.URLError):
+            client.get('index')
+
+    @patch('pandasticsearch.client.urllib.request.urlopen')
+    def test_rest_client_error_response_keeps_node_alive(self, mock_urlopen):
+        mock_urlopen.side_effect = urllib.error.HTTPError('http://es1:9200/missing', 404, 'Not Found', {}, None)
+
+        client = RestClient(['http://es1:9200', 'http://es2:9200'])
+        with self.assertRaises(ServerDefinedException):
+            client.get('missing')
+        self.assertFalse(client.nodes.is_dead('http://es1:9200'))
+        self.assertEqual(mock_urlopen.call_count, 1)
+
+    @patch('pandasticsearch.client.urllib.request.urlopen')
+    def test_rest_client_discover_nodes(self, mock_urlopen):
+        nodes = {'nodes': {
+            'n1': {'http': {'publish_address': 'es1.example.com/10.0.0.1:9200'}},
+            'n2': {'http': {'publish_address': '10.0.0.2:9200'}},
+            'n3': {},
+        }}
+        response = Mock()
+        response.read.side_effect = [json.dumps(nodes).encode('utf-8'), b'{}']
+        mock_urlopen.return_value = response
+
+        client = RestClient('https://es:9200', discover_nodes=True)
+        client.get('index')
+        urls = [c[0][0].get_full_url() for c in mock_urlopen.call_args_list]
+        self.assertEqual(urls, ['https://es:9200/_nodes/http', 'https://10.0.0.1:9200/index'])
+        self.assertEqual(client.nodes.hosts, ['https://10.0.0.1:9200', 'https://10.0.0.2:9200'])
+
+    @patch('pandasticsearch.retry.time.sleep')
+    @patch('pandasticsearch.client.urllib.request.urlopen')
+    def test_rest_client_retries_overload(self, mock_urlopen, mock_sleep):
+        response = Mock()
+        response.read.return_value = b'{"ok": true}'
+        busy = urllib.error.HTTPError('http://localhost:9200/index/_search', 429, 'Too Many Requests',
+                                      {'Retry-After': '2'}, io.BytesIO(b'{"error": "rejected"}'))
+        mock_urlopen.side_effect = [busy, busy, response]
+
+        client = RestClient('http://localhost:9200', retry=RetryPolicy(max_attempts=3))
+        self.assertEqual(client.post('index/_search', data={}), {'ok': True})
+        self.assertEqual(mock_sleep.call_args_list, [call(2.0), call(2.0)])
+
+        mock_urlopen.side_effect = [busy, busy, busy]
+        with self.assertRaises(ServerDefinedException):
+            client.post('index/_search', data={})
+
+    @patch('pandasticsearch.retry.time.sleep')
+    @patch('pandasticsearch.client.urllib.request.urlopen')
+    def test_rest_client_does_not_retry_consumed_scroll(self, mock_urlopen, mock_sleep):
+        mock_urlopen.side_effect = urllib.error.HTTPError('http://localhost:9200/_search/scroll', 502,
+                                                          'Bad Gateway', {}, None)
+
+        client = RestClient('http://localhost:9200', retry=RetryPolicy())
+        with self.assertRaises(ServerDefinedException):
+            client.post('_search/scroll', data={'scroll_id': 'x'})
+        self.assertEqual(mock_urlopen.call_count, 1)
+        self.assertFalse(mock_sleep.called)
+
+    @patch('pandasticsearch.client.urllib.request.urlopen')
+    def test_rest_client_circuit_breaker(self, mock_urlopen):
+        mock_urlopen.side_effect = urllib.error.HTTPError('http://localhost:9200/index', 503,
+                                                          'Service Unavailable', {}, None)
+
+        client = RestClient('http://localhost:9200', circuit_breaker=CircuitBreaker(failure_threshold=2))
+        for _ in range(2):
+            with self.assertRaises(ServerDefinedException):
+                client.get('index')
+        with self.assertRaises(CircuitOpenException):
+            client.get('index')
+        self.assertEqual(mock_urlopen.call_count, 2)
+
+    def test_compression(self):
+        server = start_server()
+        pool = ConnectionPool(maxsize=2)
+        try:
+            host = 'http://127.0.0.1:{0}'.format(server.server_address[1])
+            for client in (RestClient(host, pool=pool, compression='gzip'), RestClient(host, compression='gzip')):
+                # the server handles one connection at a time
+                pool.clear()
+                self.assertEqual(client.post('echo/_search', data={'size': 1}),
+                                 {'path': '/echo/_search', 'body': {'size': 1}})
+                with self.assertRaises(ServerDefinedException) as cm:
+                    client.get('missing')
+                self.assertEqual(cm.exception.args[0], 'index_not_found_exception')
+
+                stream = client.post_stream('index/_search', data={})
+                self.assertEqual(list(stream.hits()), [])
+                self.assertEqual(stream.meta, {'path': '/index/_search'})
+            self.assertEqual(len(server.peers), 4)
+        finally:
+            pool.clear()
+            server.shutdown()
+            server.server_close()
+
+    def test_pool_discards_idle_connections(self):
+        pool = ConnectionPool(maxsize=1, idle_timeout=0)
+        conn = Mock()
+        pool._put_conn(('http', 'localhost', 9200), conn)
+        pool._put_conn(('http', 'localhost', 9200), Mock())
+
+        new_conn, reused = pool._get_conn(('http', 'localhost', 9200))
+        self.assertFalse(reused)
+        self.assertTrue(conn.close.called)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,48 @@
+# -*- coding: UTF-8 -*-
+import unittest
+
+from pandasticsearch.codec import get_codec, JsonCodec
+from pandasticsearch.errors import NoSuchDependencyException
+
+
+def installed(name):
+    try:
+        get_codec(name)
+    except NoSuchDependencyException:
+        return False
+    return True
+
+
+class TestCodec(unittest.TestCase):
+    def _assert_round_trip(self, codec):
+        doc = {'query': {'terms': {'name': [u'你好', 'world']}}, 'size': 20, 'f': 1.5, 'b': True, 'n': None}
+        data = codec.dumps(doc)
+        self.assertTrue(isinstance(data, bytes))
+        self.assertEqual(codec.loads(data), doc)
+        self.assertEqual(JsonCodec().loads(data), doc)
+
+    def test_json(self):
+        self._assert_round_trip(get_codec('json'))
+
+    @unittest.skipUnless(installed('orjson'), 'requires orjson')
+    def test_orjson(self):
+        self._assert_round_trip(get_codec('orjson'))
+
+    @unittest.skipUnless(installed('ujson'), 'requires ujson')
+    def test_ujson(self):
+        self._assert_round_trip(get_codec('ujson'))
+
+    @unittest.skipUnless(installed('simdjson'), 'requires pysimdjson')
+    def test_simdjson(self):
+        self._assert_round_trip(get_codec('simdjson'))
+
+    def test_auto_detect(self):
+        self.assertTrue(isinstance(get_codec(), JsonCodec))
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            get_codec('xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: UTF-8 -*-
+import unittest
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from pandasticsearch.queries import ScrollSelect
+
+
+def mock_hits_generator():
+    yield {'_id': '1', '_source': {'a': 1, 'f': 0.5, 'ok': True, 'name': 'Alice',
+                                   'c': {'d': 'x'}, 'date': '2016-11-29T04:06:00.000Z'}}
+    yield {'_id': '2', '_source': {'a': 2, 'f': 1, 'ok': False, 'name': 'Bob',
+                                   'c': {'d': 'y'}, 'date': '2016-11-29T04:07:00.000Z'}}
+    yield {'_id': '3', '_source': {'a': 3, 'f': None, 'name': 'Leo', 'c': {'d': 'z', 'e': 'w'},
+                                   'date': '2016-11-29T04:08:00.000Z'}}
+
+
+column_types = {'a': 'integer', 'f': 'float', 'ok': 'boolean', 'name': 'keyword',
+                'c.d': 'keyword', 'c.e': 'keyword', 'date': 'date'}
+
+
+@unittest.skipIf(pandas is None, 'requires pandas')
+class TestColumnar(unittest.TestCase):
+    def test_types(self):
+        df = ScrollSelect(mock_hits_generator).to_pandas(columnar=True, column_types=column_types, capacity=2)
+        self.assertEqual(list(df['a']), [1, 2, 3])
+        self.assertEqual(str(df['a'].dtype), 'int64')
+        self.assertEqual(str(df['f'].dtype), 'float64')
+        self.assertTrue(pandas.isnull(df['f'][2]))
+        self.assertEqual(list(df['ok'][:2]), [True, False])
+        self.assertTrue(pandas.isnull(df['ok'][2]))
+        self.assertEqual(list(df['c.d']), ['x', 'y', 'z'])
+        self.assertEqual(list(pandas.isnull(df['c.e'])), [True, True, False])
+        self.assertEqual(df['c.e'][2], 'w')
+        self.assertEqual(list(df['_id']), ['1', '2', '3'])
+        self.assertTrue(str(df['date'].dtype).startswith('datetime64'))
+
+    def test_same_as_rows(self):
+        columnar = ScrollSelect(mock_hits_generator).to_pandas(columnar=True, column_types=column_types)
+        rows = ScrollSelect(mock_hits_generator).to_pandas()
+        self.assertEqual(sorted(columnar.columns), sorted(rows.columns))
+        self.assertEqual(list(columnar['name']), list(rows['name']))
+        self.assertEqual(list(columnar['a']), list(rows['a']))
+
+    def test_fallback_to_object(self):
+        def hits():
+            yield {'_source': {'a': 1}}
+            yield {'_source': {'a': [1, 2]}}
+            yield {'_source': {'a': 1.5}}
+
+        df = ScrollSelect(hits).to_pandas(columnar=True, column_types={'a': 'long'}, capacity=1)
+        self.assertEqual(list(df['a']), [1, [1, 2], 1.5])
+
+    def test_missing_int(self):
+        def hits():
+            yield {'_source': {'b': 1}}
+            yield {'_source': {'a': 2}}
+
+        df = ScrollSelect(hits).to_pandas(columnar=True, column_types={'a': 'long'}, capacity=1)
+        self.assertEqual(str(df['a'].dtype), 'float64')
+        self.assertTrue(pandas.isnull(df['a'][0]))
+        self.assertEqual(df['a'][1], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# -*- coding: UTF-8 -*-
+import gzip
+import io
+import json
+import unittest
+import zlib
+
+from pandasticsearch.compression import DecompressingResponse, check_encoding, compress, content_encoding, decompress
+from pandasticsearch.streaming import SearchResponseStream
+
+
+class _Response(io.BytesIO):
+    def __init__(self, data, headers=None):
+        super(_Response, self).__init__(data)
+        self.headers = headers or {}
+        self.reads = []
+
+    def read(self, size=-1):
+        data = super(_Response, self).read(size)
+        self.reads.append(len(data))
+        return data
+
+
+class TestCompression(unittest.TestCase):
+    def test_compress(self):
+        data = b'{"query": {"terms": {"id": [1, 2, 3]}}}' * 100
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(compress(data, 'gzip'))).read(), data)
+        self.assertEqual(zlib.decompress(compress(data, 'deflate')), data)
+        self.assertLess(len(compress(data, 'gzip')), len(data))
+
+    def test_decompress(self):
+        data = b'x' * 1000
+        self.assertEqual(decompress(compress(data, 'gzip'), 'gzip'), data)
+        self.assertEqual(decompress(compress(data, 'deflate'), 'deflate'), data)
+
+        raw = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.assertEqual(decompress(raw.compress(data) + raw.flush(), 'deflate'), data)
+
+    def test_content_encoding(self):
+        self.assertEqual(content_encoding(_Response(b'', {'Content-Encoding': 'gzip'})), 'gzip')
+        self.assertEqual(content_encoding(_Response(b'', {'Content-Encoding': 'br'})), None)
+        self.assertEqual(content_encoding(_Response(b'')), None)
+
+    def test_check_encoding(self):
+        self.assertEqual(check_encoding(None), None)
+        self.assertEqual(check_encoding('gzip'), 'gzip')
+        with self.assertRaises(ValueError):
+            check_encoding('br')
+
+    def test_streaming_decompression(self):
+        hits = [{'_source': {'a': i, 'text': 'abc' * 10}} for i in range(500)]
+        data = json.dumps({'took': 1, 'hits': {'hits': hits}}).encode('utf-8')
+        raw = _Response(compress(data, 'gzip'))
+
+        res = DecompressingResponse(raw, 'gzip', chunk_size=128)
+        self.assertEqual(list(SearchResponseStream(res, chunk_size=256).hits()), hits)
+        # the compressed body is read chunk by chunk
+        self.assertTrue(max(raw.reads) <= 128)
+        self.assertTrue(raw.closed)
+
+    def test_read_all(self):
+        data = b'abc' * 1000
+        res = DecompressingResponse(_Response(compress(data, 'deflate')), 'deflate', chunk_size=16)
+        self.assertEqual(res.read(10), data[:10])
+        self.assertEqual(res.read(), data[10:])
+        self.assertEqual(res.read(), b'')
+
+
+if __name__ == '__main__':
+    unittest.main()
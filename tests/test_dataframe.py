@@ -1,14 +1,20 @@
 # -*- coding: UTF-8 -*-
 import unittest
 from mock import patch, Mock
+import copy
+import io
 import json
+import time
 from pandasticsearch.dataframe import DataFrame, Column
 from pandasticsearch.operators import *
+from pandasticsearch.errors import ServerDefinedException
+from pandasticsearch.streaming import SearchResponseStream
 
 
-@patch('pandasticsearch.client.urllib.request.urlopen')
+@patch('pandasticsearch.connection.ConnectionPool.urlopen')
 def create_df_from_es(mock_urlopen):
     response = Mock()
+    response.status = 200
     dic = {
         "index": {
             "mappings": {
@@ -35,12 +41,13 @@ def create_df_from_es(mock_urlopen):
     return DataFrame.from_es(url="http://localhost:9200", index='index', doc_type='doc_type')
 
 
-@patch('pandasticsearch.client.urllib.request.urlopen')
+@patch('pandasticsearch.connection.ConnectionPool.urlopen')
 def create_df_from_es_after_removal_mapping(mock_urlopen):
     """
     https://www.elastic.co/guide/en/elasticsearch/reference/current/removal-of-types.html
     """
     response = Mock()
+    response.status = 200
     dic = {
         "index": {
             "mappings": {
@@ -65,6 +72,84 @@ def create_df_from_es_after_removal_mapping(mock_urlopen):
     return DataFrame.from_es(url="http://localhost:9200", index='index', compat=7)
 
 
+class ScrollClient(object):
+    """
+    Serves ``pages`` pages of ``page_size`` hits for each slice of a scroll search.
+    """
+
+    def __init__(self, pages=3, page_size=2):
+        self.pages = pages
+        self.page_size = page_size
+        self.bodies = []
+        self.paths = []
+        self.cleared = []
+
+    def _page(self, slice_id, page):
+        if page >= self.pages:
+            hits = []
+        else:
+            hits = [{'_source': {'a': slice_id, 'b': page * self.page_size + i}} for i in range(self.page_size)]
+        return {'_scroll_id': '{0}:{1}'.format(slice_id, page), 'hits': {'hits': hits}}
+
+    def post(self, path, data, params=None):
+        self.bodies.append(data)
+        self.paths.append((path, params))
+        if path == '_search/scroll':
+            slice_id, page = data['scroll_id'].split(':')
+            return self._page(int(slice_id), int(page) + 1)
+        return self._page(data.get('slice', {}).get('id', 0), 0)
+
+    def delete(self, path, data=None, params=None):
+        assert path == '_search/scroll'
+        self.cleared.extend(data['scroll_id'])
+        return {'succeeded': True}
+
+
+class StreamClient(ScrollClient):
+    def post_stream(self, path, data, params=None):
+        resp = self.post(path, data, params=params)
+        return SearchResponseStream(io.BytesIO(json.dumps(resp).encode('utf-8')), chunk_size=7)
+
+
+class PitClient(object):
+    """
+    Serves ``total`` documents sorted by their ``_shard_doc`` through search_after.
+    """
+
+    def __init__(self, total=5, fail_after=None):
+        self.total = total
+        self.fail_after = fail_after
+        self.opened = []
+        self.closed = []
+        self.bodies = []
+
+    def post(self, path, data, params=None):
+        if path == 'index/_pit':
+            self.opened.append('pit-{0}'.format(len(self.opened)))
+            return {'id': self.opened[-1]}
+        assert path == '_search'
+        if data['pit']['id'] in self.closed:
+            raise ServerDefinedException({'type': 'search_context_missing_exception'})
+        self.bodies.append(copy.deepcopy(data))
+        start = data.get('search_after', [-1])[-1] + 1
+        if self.fail_after is not None and start >= self.fail_after:
+            raise ServerDefinedException({'type': 'es_rejected_execution_exception'})
+        end = min(start + data['size'], self.total)
+        hits = [{'_source': {'a': i}, 'sort': [i]} for i in range(start, end)]
+        return {'pit_id': data['pit']['id'], 'hits': {'hits': hits}}
+
+    def delete(self, path, data=None, params=None):
+        assert path == '_pit'
+        self.closed.append(data['id'])
+        return {'succeeded': True}
+
+
+def create_df_with_client(client, **kwargs):
+    kwargs.setdefault('compat', 5)
+    return DataFrame(client=client, index='index', mapping=create_df_from_es()._mapping,
+                     doc_type='doc_type', **kwargs)
+
+
 class TestDataFrame(unittest.TestCase):
     def test_getitem(self):
         df = create_df_from_es()
@@ -93,6 +178,10 @@ class TestDataFrame(unittest.TestCase):
         df = create_df_from_es()
         self.assertEqual(df.columns, ['a', 'b', 'c.d', 'c.e'])
 
+    def test_column_types(self):
+        df = create_df_from_es()
+        self.assertEqual(df._get_column_types(), {'a': 'integer', 'b': 'integer', 'c.d': 'keyword', 'c.e': 'keyword'})
+
     def test_print_schema(self):
         df = create_df_from_es()
         df.print_schema()
@@ -107,35 +196,35 @@ class TestDataFrame(unittest.TestCase):
 
     def test_init(self):
         df = create_df_from_es()
-        self.assertEqual(df.to_dict(), {'size': 20})
+        self.assertEqual(df.to_dict(), {'size': 100})
 
     def test_filter(self):
         df = create_df_from_es()
 
         self.assertEqual((df.filter(df['a'] > 2)).to_dict(),
                          {'query': {'filtered': {'filter': {'range': {'a': {'gt': 2}}}}},
-                          'size': 20})
+                          'size': 100})
 
         self.assertEqual((df.filter((df['a'] > 2) & (df.b == 1))).to_dict(),
                          {'query': {'filtered': {'filter': {'bool': {'must': [
                              {'range': {'a': {'gt': 2}}},
                              {'term': {'b': 1}}]}}}},
-                             'size': 20})
+                             'size': 100})
 
         self.assertEqual((df.filter(df['a'] > 2).filter(df.b == 1)).to_dict(),
                          {'query': {'filtered': {'filter': {'bool': {'must': [
                              {'range': {'a': {'gt': 2}}},
                              {'term': {'b': 1}}]}}}},
-                             'size': 20})
+                             'size': 100})
 
         self.assertEqual(df.where(Greater('a', 2)).to_dict(),
                          {'query': {'filtered': {'filter': {'range': {'a': {'gt': 2}}}}},
-                          'size': 20})
+                          'size': 100})
 
         self.assertEqual(df.filter('2016 - doc["age"].value > 1995').to_dict(),
                          {'query': {'filtered': {
                              'filter': {'script': {'script': {'inline': '2016 - doc["age"].value > 1995'}}}}},
-                             'size': 20})
+                             'size': 100})
 
     def test_groupby(self):
         df = create_df_from_es()
@@ -161,30 +250,31 @@ class TestDataFrame(unittest.TestCase):
     def test_sort(self):
         df = create_df_from_es()
         self.assertEqual((df.sort(df['a'].asc)).to_dict(),
-                         {'sort': [{'a': {'order': 'asc'}}], 'size': 20})
+                         {'sort': [{'a': {'order': 'asc'}}], 'size': 100})
 
         self.assertEqual((df.sort(Sorter('a'), Sorter('b'))).to_dict(),
                          {'sort': [{'a': {'order': 'desc'}},
-                                   {'b': {'order': 'desc'}}], 'size': 20})
+                                   {'b': {'order': 'desc'}}], 'size': 100})
 
         self.assertEqual((df.sort('doc["age"].value * 2')).to_dict(),
                          {'sort': [{'_script': {
                              'order': 'desc',
                              'script': 'doc["age"].value * 2',
                              'type': 'number'
-                         }}], 'size': 20})
+                         }}], 'size': 100})
 
     def test_select(self):
         df = create_df_from_es()
         self.assertEqual(df.select('a').to_dict(),
-                         {'_source': {'excludes': [], 'includes': ['a']}, 'size': 20})
+                         {'_source': {'excludes': [], 'includes': ['a']}, 'size': 100})
 
         self.assertEqual(df.select(df['a'], df['b']).to_dict(),
-                         {'_source': {'excludes': [], 'includes': ['a', 'b']}, 'size': 20})
+                         {'_source': {'excludes': [], 'includes': ['a', 'b']}, 'size': 100})
 
     def test_limit(self):
         df = create_df_from_es()
-        self.assertEqual(df.limit(199).to_dict(), {'size': 20})
+        self.assertEqual(df.limit(199).to_dict(), {'size': 199})
+        self.assertEqual(df.limit(100000).to_dict(), {'size': 5000})
 
     def test_complex(self):
         df = create_df_from_es()
@@ -196,7 +286,7 @@ class TestDataFrame(unittest.TestCase):
         self.assertEqual(df3.to_dict(),
                          {'_source': {'excludes': [], 'includes': ['a']},
                           'query': {'filtered': {'filter': {'range': {'a': {'gt': 2}}}}},
-                          'size': 20})
+                          'size': 30})
 
         df4 = df3.groupby('b')
         df5 = df4.agg(MetricAggregator('a', 'avg'))
@@ -248,6 +338,110 @@ class TestDataFrame(unittest.TestCase):
                                                  'avg(a)': {'avg': {'field': 'a'}}}}
                                      }}}})
 
+    def test_scroll(self):
+        client = ScrollClient(pages=3, page_size=2)
+        rows = create_df_with_client(client, batch_size=2).limit(5).collect()
+        self.assertEqual([row['b'] for row in rows], [0, 1, 2, 3, 4])
+
+        rows = create_df_with_client(client, batch_size=2).collect()
+        self.assertEqual(len(rows), 6)
+
+    def test_scroll_cleared(self):
+        client = ScrollClient(pages=3, page_size=2)
+        create_df_with_client(client, batch_size=2).collect()
+        self.assertEqual(client.cleared, ['0:3'])
+
+        client = ScrollClient(pages=3, page_size=2)
+        create_df_with_client(client, batch_size=2).limit(3).collect()
+        self.assertEqual(client.cleared, ['0:1'])
+
+    def test_scroll_select_close(self):
+        client = ScrollClient(pages=3, page_size=2)
+        with create_df_with_client(client, batch_size=2)._execute() as query:
+            rows = query.row_generator()
+            next(rows)
+            self.assertEqual(client.cleared, [])
+        self.assertEqual(client.cleared, ['0:0'])
+
+    def test_streaming_scroll(self):
+        client = StreamClient(pages=3, page_size=2)
+        rows = create_df_with_client(client, batch_size=2, streaming=True).limit(5).collect()
+        self.assertEqual([row['b'] for row in rows], [0, 1, 2, 3, 4])
+        self.assertEqual(client.cleared, ['0:2'])
+
+        rows = create_df_with_client(client, streaming=True).limit(2).collect()
+        self.assertEqual(len(rows), 2)
+
+    def test_scroll_keepalive(self):
+        client = ScrollClient(pages=3, page_size=2)
+        create_df_with_client(client, batch_size=2, scroll_keepalive='5m').collect()
+        self.assertEqual(client.paths[0], ('index/doc_type/_search', {'scroll': '5m'}))
+        self.assertEqual(client.bodies[1]['scroll'], '5m')
+
+    def test_single_page_without_scroll(self):
+        client = ScrollClient(pages=3, page_size=2)
+        rows = create_df_with_client(client).limit(2).collect()
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(client.paths, [('index/doc_type/_search', None)])
+        self.assertEqual(client.bodies[0]['size'], 2)
+
+    def test_sliced_scroll(self):
+        client = ScrollClient(pages=3, page_size=2)
+        rows = create_df_with_client(client, batch_size=2).collect(slices=3)
+        self.assertEqual(sorted((row['a'], row['b']) for row in rows),
+                         [(a, b) for a in range(3) for b in range(6)])
+        slices = sorted(body['slice']['id'] for body in client.bodies if 'slice' in body)
+        self.assertEqual(slices, [0, 1, 2])
+        self.assertTrue(all(body['slice']['max'] == 3 for body in client.bodies if 'slice' in body))
+
+    def test_sliced_scroll_limit(self):
+        client = ScrollClient(pages=100, page_size=2)
+        rows = create_df_with_client(client, batch_size=2).limit(7).collect(slices=4)
+        self.assertEqual(len(rows), 7)
+        for _ in range(50):
+            if len(client.cleared) == 4:
+                break
+            time.sleep(0.1)
+        self.assertEqual(sorted(scroll_id.split(':')[0] for scroll_id in client.cleared), ['0', '1', '2', '3'])
+
+    def test_pit_pagination(self):
+        client = PitClient(total=5)
+        df = create_df_with_client(client, batch_size=2, pagination='pit', compat=7)
+        rows = df.sort(Sorter('a', order='asc')).collect()
+        self.assertEqual([row['a'] for row in rows], list(range(5)))
+        self.assertEqual(client.bodies[0]['sort'], [{'a': {'order': 'asc'}}, {'_shard_doc': 'asc'}])
+        self.assertEqual(client.bodies[0]['pit'], {'id': 'pit-0', 'keep_alive': '1m'})
+        self.assertNotIn('search_after', client.bodies[0])
+        self.assertEqual(client.bodies[1]['search_after'], [1])
+        self.assertEqual(client.closed, ['pit-0'])
+
+        client = PitClient(total=5)
+        rows = create_df_with_client(client, batch_size=2, pagination='pit', compat=7).limit(3).collect()
+        self.assertEqual([row['a'] for row in rows], [0, 1, 2])
+        self.assertEqual(client.bodies[-1]['size'], 1)
+
+    def test_pit_resume(self):
+        client = PitClient(total=6, fail_after=4)
+        df = create_df_with_client(client, batch_size=2, pagination='pit', compat=7)
+        query = df._execute()
+        rows = []
+        with self.assertRaises(ServerDefinedException):
+            for row in query.row_generator():
+                rows.append(row['a'])
+        self.assertEqual(rows, [0, 1, 2, 3])
+        self.assertEqual(client.closed, [])
+
+        client.fail_after = None
+        rows = [row['a'] for row in df.resume_from(query.cursor).collect()]
+        self.assertEqual(rows, [4, 5])
+        self.assertEqual(client.opened, ['pit-0'])
+
+        # the point in time expired meanwhile
+        client.closed.append('pit-0')
+        rows = [row['a'] for row in df.limit(5).resume_from(query.cursor).collect()]
+        self.assertEqual(rows, [4])
+        self.assertEqual(client.opened, ['pit-0', 'pit-1'])
+
 
 if __name__ == '__main__':
     unittest.main()
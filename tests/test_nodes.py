@@ -0,0 +1,69 @@
+# -*- coding: UTF-8 -*-
+import unittest
+
+from pandasticsearch.nodes import NodePool
+
+
+class TestNodePool(unittest.TestCase):
+    def test_round_robin(self):
+        nodes = NodePool(['http://a', 'http://b', 'http://c'])
+        hosts = []
+        for _ in range(6):
+            host = nodes.acquire()
+            nodes.release(host)
+            hosts.append(host)
+        self.assertEqual(hosts, ['http://a', 'http://b', 'http://c'] * 2)
+
+    def test_single_host(self):
+        nodes = NodePool('http://a')
+        self.assertEqual(nodes.hosts, ['http://a'])
+        self.assertEqual(nodes.acquire(), 'http://a')
+
+    def test_least_in_flight(self):
+        nodes = NodePool(['http://a', 'http://b', 'http://c'], selector='least_in_flight')
+        first = nodes.acquire()
+        second = nodes.acquire()
+        third = nodes.acquire()
+        self.assertEqual(len({first, second, third}), 3)
+
+        nodes.release(second)
+        self.assertEqual(nodes.acquire(), second)
+        self.assertEqual(nodes.in_flight(second), 1)
+
+    def test_dead_node_left_out(self):
+        nodes = NodePool(['http://a', 'http://b'], dead_timeout=60)
+        nodes.mark_dead('http://a')
+        self.assertTrue(nodes.is_dead('http://a'))
+        self.assertEqual([nodes.acquire() for _ in range(3)], ['http://b'] * 3)
+
+        nodes.mark_live('http://a')
+        self.assertIn('http://a', [nodes.acquire() for _ in range(2)])
+
+    def test_dead_node_retried_after_timeout(self):
+        nodes = NodePool(['http://a', 'http://b'], dead_timeout=0)
+        nodes.mark_dead('http://a')
+        self.assertIn('http://a', [nodes.acquire() for _ in range(2)])
+
+    def test_all_dead(self):
+        nodes = NodePool(['http://a', 'http://b'], dead_timeout=60)
+        nodes.mark_dead('http://b')
+        nodes.mark_dead('http://a')
+        # the node dead for the longest time is tried again
+        self.assertEqual(nodes.acquire(), 'http://b')
+
+    def test_set_hosts(self):
+        nodes = NodePool(['http://a', 'http://b'])
+        nodes.mark_dead('http://a')
+        nodes.set_hosts(['http://a', 'http://c'])
+        self.assertEqual(nodes.hosts, ['http://a', 'http://c'])
+        self.assertEqual(nodes.acquire(), 'http://c')
+        with self.assertRaises(ValueError):
+            nodes.set_hosts([])
+
+    def test_invalid_selector(self):
+        with self.assertRaises(ValueError):
+            NodePool(['http://a'], selector='random')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -49,6 +49,38 @@ class TestQueries(unittest.TestCase):
         self.assertEquals(select.result[:2], select.result[:2])
         self.assertEqual(len(select), 3)
 
+    def test_scroll_select_cache(self):
+        calls = []
+
+        def hits_generator():
+            calls.append(1)
+            for hit in mock_hits_generator():
+                yield hit
+
+        select = ScrollSelect(hits_generator)
+        self.assertEqual(select[0], {'a': 1, 'b': 1})
+        self.assertEqual(select[:2], [{'a': 1, 'b': 1}, {'a': 2, 'b': 2}])
+        self.assertEqual(len(select), 3)
+        self.assertEqual(select[-1], {'a': 3, 'b': 3})
+        self.assertEqual(list(select), select.result)
+        str(select)
+        self.assertEqual(len(calls), 1)
+
+    def test_scroll_select_partial_fetch(self):
+        fetched = []
+
+        def hits_generator():
+            for hit in mock_hits_generator():
+                fetched.append(hit)
+                yield hit
+
+        select = ScrollSelect(hits_generator)
+        self.assertEqual(select[1], {'a': 2, 'b': 2})
+        self.assertEqual(len(fetched), 2)
+
+        select.close()
+        self.assertEqual(len(select), 3)
+
     def test_select_result(self):
         select = Select.from_dict(create_hits())
         print(select.result)
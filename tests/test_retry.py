@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+import email.utils
+import time
+import unittest
+
+from pandasticsearch.errors import CircuitOpenException
+from pandasticsearch.retry import CircuitBreaker, RetryPolicy
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_idempotent_requests(self):
+        retry = RetryPolicy()
+        self.assertTrue(retry.is_retryable('GET', 'index', 429))
+        self.assertTrue(retry.is_retryable('DELETE', '_search/scroll', 502))
+        self.assertTrue(retry.is_retryable('POST', 'index/doc/_search', 504))
+        self.assertTrue(retry.is_retryable('POST', '/index/_count', 503))
+        self.assertFalse(retry.is_retryable('POST', 'index/_doc', 503))
+        self.assertFalse(retry.is_retryable('GET', 'index', 500))
+
+    def test_scroll_continuation(self):
+        retry = RetryPolicy()
+        self.assertTrue(retry.is_retryable('POST', '_search/scroll', 429))
+        self.assertTrue(retry.is_retryable('POST', '_search/scroll', 503))
+        # the page may have been consumed behind a proxy
+        self.assertFalse(retry.is_retryable('POST', '_search/scroll', 502))
+        self.assertFalse(retry.is_retryable('POST', '_search/scroll', 504))
+
+    def test_backoff(self):
+        retry = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+        self.assertEqual([retry.backoff(i) for i in range(5)], [0.5, 1, 2, 3, 3])
+
+        retry = RetryPolicy(backoff_factor=0.5, max_backoff=3)
+        for i in range(5):
+            self.assertTrue(0 <= retry.backoff(i) <= min(3, 0.5 * 2 ** i))
+
+    def test_retry_after(self):
+        retry = RetryPolicy(jitter=False)
+        self.assertEqual(retry.delay(0, '7'), 7)
+        self.assertEqual(retry.delay(1, None), 1)
+        self.assertEqual(retry.delay(1, 'soon'), 1)
+
+        date = email.utils.formatdate(time.time() + 60, usegmt=True)
+        self.assertTrue(55 <= retry.delay(0, date) <= 60)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record(429)
+        breaker.before_request()
+        breaker.record(200)
+        breaker.record(429)
+        self.assertEqual(breaker.state, 'closed')
+        breaker.record(503)
+        self.assertEqual(breaker.state, 'open')
+        with self.assertRaises(CircuitOpenException):
+            breaker.before_request()
+
+    def test_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, 'half_open')
+        # a single trial request
+        breaker.before_request()
+        with self.assertRaises(CircuitOpenException):
+            breaker.before_request()
+
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_success()
+        self.assertEqual(breaker.state, 'closed')
+        breaker.before_request()
+        breaker.before_request()
+
+    def test_non_overload_errors_close(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record(429)
+        breaker.record(404)
+        breaker.record(429)
+        self.assertEqual(breaker.state, 'closed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+import io
+import json
+import unittest
+
+from pandasticsearch.errors import ParseResultException
+from pandasticsearch.streaming import SearchResponseStream
+
+
+def create_response():
+    return {
+        '_scroll_id': 'abc',
+        'took': 12,
+        'timed_out': False,
+        '_shards': {'total': 1, 'successful': 1},
+        'hits': {
+            'total': {'value': 3},
+            'max_score': 1.5,
+            'hits': [
+                {'_id': '1', '_source': {'a': 1, 's': u'你好,"世界"'}},
+                {'_id': '2', '_source': {'a': [1, 2.5], 'b': {'c': None}}},
+                {'_id': '3', '_source': {}},
+            ]
+        },
+        'trailing': 1234567,
+    }
+
+
+class TestStreaming(unittest.TestCase):
+    def test_hits(self):
+        resp = create_response()
+        for indent in (None, 2):
+            data = json.dumps(resp, indent=indent, ensure_ascii=False).encode('utf-8')
+            for chunk_size in (1, 3, 16, 1024):
+                stream = SearchResponseStream(io.BytesIO(data), chunk_size=chunk_size)
+                self.assertEqual(list(stream.hits()), resp['hits']['hits'])
+                self.assertEqual(stream.meta['_scroll_id'], 'abc')
+                self.assertEqual(stream.meta['trailing'], 1234567)
+                self.assertEqual(stream.meta['hits'], {'total': {'value': 3}, 'max_score': 1.5})
+
+    def test_meta_before_hits(self):
+        data = json.dumps(create_response()).encode('utf-8')
+        stream = SearchResponseStream(io.BytesIO(data), chunk_size=8)
+        hits = stream.hits()
+        next(hits)
+        self.assertEqual(stream.meta['_scroll_id'], 'abc')
+        self.assertNotIn('trailing', stream.meta)
+        hits.close()
+
+    def test_empty_hits(self):
+        stream = SearchResponseStream(io.BytesIO(b'{"hits": {"hits": []}}'))
+        self.assertEqual(list(stream.hits()), [])
+
+    def test_truncated(self):
+        data = json.dumps(create_response()).encode('utf-8')[:-40]
+        stream = SearchResponseStream(io.BytesIO(data), chunk_size=16)
+        with self.assertRaises(ParseResultException):
+            list(stream.hits())
+
+
+if __name__ == '__main__':
+    unittest.main()